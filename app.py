@@ -1,18 +1,23 @@
 import streamlit as st
 import os
-import json
+import shutil
+import orjson
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Importar módulos do projeto
-from evaluator import StartupEvaluator
+from cache import NullCache
+from evaluator import StartupEvaluator, setup_observability
 from model_config import AVAILABLE_MODELS, DEFAULT_MODEL
 from prompts import DEFAULT_PROMPT_VERSION
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
+# Observabilidade (Logfire), configurada uma única vez por processo
+setup_observability()
+
 # Configuração da página
 st.set_page_config(
     page_title="Analisador de Startups - Astella",
@@ -28,11 +33,16 @@ OUTPUT_DIR = Path("Outputs")
 INPUT_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Ícones para critérios atendidos / não atendidos
+_CHECK = {True: "✅", False: "❌"}
+
 def save_uploaded_file(uploaded_file):
     """Salva o arquivo enviado no diretório de Inputs."""
     file_path = INPUT_DIR / uploaded_file.name
+    # Copia em blocos de 1 MiB para não duplicar o PDF inteiro em memória
+    uploaded_file.seek(0)
     with open(file_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+        shutil.copyfileobj(uploaded_file, f, length=1 << 20)
     return file_path
 
 def save_analysis_result(result, pdf_name):
@@ -43,11 +53,40 @@ def save_analysis_result(result, pdf_name):
     filename = f"{timestamp}_{base_name}.json"
     file_path = OUTPUT_DIR / filename
     
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=4, ensure_ascii=False)
+    # orjson mantém UTF-8 sem escape (equivalente a ensure_ascii=False)
+    file_path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
     
     return file_path
 
+@st.cache_resource
+def get_evaluator(extraction_model, evaluation_model, prompt_version, use_cache=True):
+    """Retorna um avaliador reutilizável por combinação de modelos, prompt e uso do cache."""
+    return StartupEvaluator(
+        extraction_model=extraction_model,
+        evaluation_model=evaluation_model,
+        prompt_version=prompt_version,
+        cache=None if use_cache else NullCache()
+    )
+
+@st.cache_data(ttl=5)
+def list_history(output_dir: str) -> list[str]:
+    """Lista os JSONs de análises (mais recentes primeiro; o nome começa com o timestamp)."""
+    with os.scandir(output_dir) as entries:
+        return sorted(
+            (e.name for e in entries if e.name.endswith(".json") and e.is_file()),
+            reverse=True
+        )
+
+@st.cache_data
+def load_history_json(path: str, mtime: float) -> dict:
+    """Carrega uma análise salva (mtime na chave invalida o cache se o arquivo mudar)."""
+    return orjson.loads(Path(path).read_bytes())
+
+def _bullets(items):
+    """Exibe uma lista em markdown (um único componente em vez de um por item; nada se vazia)."""
+    if items:
+        st.markdown("\n".join(f"- {item}" for item in items))
+
 def display_result(result):
     """Exibe o resultado da avaliação de forma estruturada."""
     
@@ -92,42 +131,34 @@ def display_result(result):
     # Critérios Detalhados
     st.subheader("🔍 Análise de Critérios")
     
-    criterios = result.get('criterios_atendidos', {})
-    
-    # Helper para exibir booleanos com ícones
-    def check_icon(value):
-        return "✅" if value else "❌"
+    # Extrai todos os critérios de uma vez (suporta valores ausentes/None)
+    criterios = result.get('criterios_atendidos') or {}
+    loc, estagio, fin, prod, time = (
+        criterios.get(key) or {}
+        for key in ('localizacao', 'estagio_adequado', 'metricas_financeiro', 'produto_tracao', 'equipe')
+    )
 
     # Aba para cada seção de critérios
     tab1, tab2, tab3 = st.tabs(["Tese & Estágio", "Métricas & Finanças", "Produto & Time"])
     
     with tab1:
-        loc = criterios.get('localizacao', {})
-        estagio = criterios.get('estagio_adequado', {})
-        
-        st.write(f"**Localização (Brasil):** {check_icon(loc.get('atendido'))}")
+        st.write(f"**Localização (Brasil):** {_CHECK[bool(loc.get('atendido'))]}")
         st.caption(loc.get('evidencia_encontrada'))
         
-        st.write(f"**Estágio Adequado:** {check_icon(estagio.get('atendido'))}")
+        st.write(f"**Estágio Adequado:** {_CHECK[bool(estagio.get('atendido'))]}")
         st.caption(estagio.get('evidencia_encontrada'))
 
     with tab2:
-        fin = criterios.get('metricas_financeiro', {})
         # Removido tamanho_mercado pois não está no modelo de critérios
-        
-        st.write(f"**Métricas Financeiras:** {check_icon(fin.get('atendido'))}")
+        st.write(f"**Métricas Financeiras:** {_CHECK[bool(fin.get('atendido'))]}")
         st.caption(fin.get('evidencia_encontrada'))
 
     with tab3:
-        # Mapeando nomes corretos do modelo
-        prod = criterios.get('produto_tracao', {})
-        time = criterios.get('equipe', {})
         # Removido cap_table pois não está no modelo de critérios
-        
-        st.write(f"**Produto & Tração:** {check_icon(prod.get('atendido'))}")
+        st.write(f"**Produto & Tração:** {_CHECK[bool(prod.get('atendido'))]}")
         st.caption(prod.get('evidencia_encontrada'))
         
-        st.write(f"**Equipe:** {check_icon(time.get('atendido'))}")
+        st.write(f"**Equipe:** {_CHECK[bool(time.get('atendido'))]}")
         st.caption(time.get('evidencia_encontrada'))
 
     st.divider()
@@ -137,14 +168,12 @@ def display_result(result):
     with c1:
         st.success("💪 Pontos Fortes")
         # Corrigido para 'pontos_positivos'
-        for p in result.get('pontos_positivos', []):
-            st.write(f"- {p}")
+        _bullets(result.get('pontos_positivos', []))
             
     with c2:
         st.error("⚠️ Riscos e Gaps")
         # Corrigido para 'pontos_negativos'
-        for r in result.get('pontos_negativos', []):
-            st.write(f"- {r}")
+        _bullets(result.get('pontos_negativos', []))
 
     # Removido st.info("Recomendação") pois não existe campo específico, 
     # a recomendação está implícita na justificativa/nota.
@@ -183,6 +212,12 @@ def main():
         ["astella", "v2"],
         index=0
     )
+    
+    use_cache = st.sidebar.checkbox(
+        "Reaproveitar respostas em cache",
+        value=True,
+        help="Desmarque para forçar uma nova chamada ao LLM (ex.: ao iterar nos prompts)"
+    )
 
     st.title("Avaliação de Startups via PDF")
     
@@ -199,18 +234,15 @@ def main():
                         # Salvar arquivo
                         pdf_path = save_uploaded_file(uploaded_file)
                         
-                        # Inicializar avaliador
-                        evaluator = StartupEvaluator(
-                            extraction_model=extraction_model,
-                            evaluation_model=evaluation_model,
-                            prompt_version=prompt_version
-                        )
+                        # Obter avaliador (reaproveitado entre execuções)
+                        evaluator = get_evaluator(extraction_model, evaluation_model, prompt_version, use_cache)
                         
                         # Executar análise
                         result = evaluator.evaluate(str(pdf_path))
                         
                         # Salvar resultado
                         json_path = save_analysis_result(result, uploaded_file.name)
+                        list_history.clear()
                         
                         st.success("Análise concluída com sucesso!")
                         display_result(result)
@@ -223,22 +255,21 @@ def main():
     # --- ABA HISTÓRICO ---
     with tab_historico:
         # Listar arquivos JSON no diretório Outputs
-        history_files = sorted(list(OUTPUT_DIR.glob("*.json")), reverse=True)
+        history_files = list_history(str(OUTPUT_DIR))
         
         if not history_files:
             st.info("Nenhuma análise anterior encontrada.")
         else:
-            selected_file = st.selectbox(
+            selected_name = st.selectbox(
                 "Selecione uma análise anterior:",
-                history_files,
-                format_func=lambda x: x.name
+                history_files
             )
             
-            if selected_file:
-                with open(selected_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+            if selected_name:
+                selected_file = OUTPUT_DIR / selected_name
+                data = load_history_json(str(selected_file), selected_file.stat().st_mtime)
                 
-                st.markdown(f"### Visualizando: {selected_file.name}")
+                st.markdown(f"### Visualizando: {selected_name}")
                 display_result(data)
 
 if __name__ == "__main__":
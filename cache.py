@@ -0,0 +1,101 @@
+"""
+Cache de respostas do LLM (extrações e avaliações).
+Os backends guardam o JSON serializado da saída do agente, indexado por uma chave de conteúdo.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Protocol
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Diretório padrão do cache em disco
+CACHE_DIR = Path("Outputs") / ".cache"
+
+# Validade padrão das entradas (7 dias)
+DEFAULT_TTL = 7 * 86400
+
+
+class CacheBackend(Protocol):
+    """Interface mínima de um backend de cache (memória, disco, redis...)."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Retorna o valor associado à chave, ou None se ausente/expirado."""
+        ...
+
+    def set(self, key: str, value: bytes) -> None:
+        """Grava o valor associado à chave."""
+        ...
+
+
+class MemoryCache:
+    """Cache em memória do processo, útil em testes e sessões interativas."""
+
+    def __init__(self, ttl: Optional[float] = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+
+
+class DiskCache:
+    """Cache em disco: um arquivo JSON por chave, expirado pela data de modificação."""
+
+    def __init__(self, directory: Path = CACHE_DIR, ttl: Optional[float] = DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                # Remove a entrada vencida para o diretório não crescer indefinidamente
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Falha ao ler o cache ({path.name}): {e}")
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        """Grava de forma atômica (arquivo temporário + os.replace)."""
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o cache ({path.name}): {e}")
+
+
+class NullCache:
+    """Backend que não guarda nada: força novas chamadas ao LLM (ex.: --no-cache)."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes) -> None:
+        pass
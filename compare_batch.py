@@ -1,6 +1,8 @@
 
+import argparse
 import os
 import sys
+import asyncio
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
@@ -9,15 +11,56 @@ from dotenv import load_dotenv
 # Add current directory to path so we can import modules
 sys.path.append(os.getcwd())
 
-from evaluator import StartupEvaluator
+from cache import NullCache
+from evaluator import StartupEvaluator, run_sync, setup_observability
 from model_config import DEFAULT_MODEL
 
 # Load env vars
 load_dotenv()
+setup_observability()
 
 console = Console()
 
-def run_comparison(pdf_folder="Inputs"):
+# Número máximo de chamadas simultâneas ao LLM
+MAX_CONCURRENCY = 8
+
+async def _compare_all(pdf_files, evaluators, record):
+    """
+    Avalia todos os PDFs com todas as variantes concorrentemente.
+
+    Chamadas ao LLM são I/O-bound, então PDFs e variantes rodam em paralelo
+    (limitado por MAX_CONCURRENCY). A extração não depende da versão do prompt
+    (mesmo modelo e mesmo prompt de extração), então cada PDF é extraído uma
+    única vez e reaproveitado por todas as variantes.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    extractor = next(iter(evaluators.values()))
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    async def process_pdf(pdf_file):
+        pdf_name = pdf_file.name
+        try:
+            pdf_info = await bounded(extractor.extract_info_async(str(pdf_file)))
+        except Exception as e:
+            for variant in evaluators:
+                record(pdf_name, variant, e)
+            return
+
+        console.print(f"[cyan]Extraído: {pdf_name}. Avaliando V2 e Astella...[/cyan]")
+        outcomes = await asyncio.gather(
+            *(bounded(evaluator.evaluate_from_info_async(pdf_info)) for evaluator in evaluators.values()),
+            return_exceptions=True
+        )
+        for variant, outcome in zip(evaluators, outcomes):
+            record(pdf_name, variant, outcome)
+
+    await asyncio.gather(*(process_pdf(pdf_file) for pdf_file in pdf_files))
+
+
+def run_comparison(pdf_folder="Inputs", use_cache=True):
     pdf_path = Path(pdf_folder)
     if not pdf_path.exists():
         console.print(f"[red]Pasta nao encontrada: {pdf_folder}[/red]")
@@ -30,55 +73,41 @@ def run_comparison(pdf_folder="Inputs"):
 
     console.print(f"[bold]Iniciando Comparativo V2 vs Astella (V3) para {len(pdf_files)} PDFs[/bold]\n")
 
-    # Initialize evaluators
+    # Initialize evaluators (--no-cache força novas chamadas ao iterar nos prompts)
+    cache = None if use_cache else NullCache()
     try:
         evaluator_v2 = StartupEvaluator(
             extraction_model=DEFAULT_MODEL, 
             evaluation_model=DEFAULT_MODEL, 
-            prompt_version="v2"
+            prompt_version="v2",
+            cache=cache
         )
         evaluator_astella = StartupEvaluator(
             extraction_model=DEFAULT_MODEL, 
             evaluation_model=DEFAULT_MODEL, 
-            prompt_version="astella"
+            prompt_version="astella",
+            cache=cache
         )
     except Exception as e:
         console.print(f"[red]Erro ao inicializar avaliadores: {str(e)}[/red]")
         return
 
-    results = []
-
-    for pdf_file in pdf_files:
-        pdf_name = pdf_file.name
-        console.print(f"[cyan]Processando: {pdf_name}...[/cyan]")
+    evaluators = {"v2": evaluator_v2, "astella": evaluator_astella}
+    rows = {pdf_file.name: {"pdf": pdf_file.name} for pdf_file in pdf_files}
 
-        row_data = {"pdf": pdf_name}
-
-        # Run V2
-        try:
-            res_v2 = evaluator_v2.evaluate(str(pdf_file))
-            row_data["v2_score"] = res_v2.get("nota", 0)
-            row_data["v2_desc"] = res_v2.get("nota_descricao", "")
-            # Try to get preliminary analysis or reason from V2 if needed, but score is main metric
-        except Exception as e:
-            console.print(f"[red]Erro V2 em {pdf_name}: {e}[/red]")
-            row_data["v2_score"] = "Erro"
-            row_data["v2_desc"] = str(e)
+    def record(pdf_name, variant, outcome):
+        row_data = rows[pdf_name]
+        if isinstance(outcome, BaseException):
+            console.print(f"[red]Erro {variant} em {pdf_name}: {outcome}[/red]")
+            row_data[f"{variant}_score"] = "Erro"
+            row_data[f"{variant}_desc"] = str(outcome)
+        else:
+            row_data[f"{variant}_score"] = outcome.get("nota", 0)
+            row_data[f"{variant}_desc"] = outcome.get("nota_descricao", "")
 
-        # Run Astella
-        try:
-            res_astella = evaluator_astella.evaluate(str(pdf_file))
-            row_data["astella_score"] = res_astella.get("nota", 0)
-            row_data["astella_desc"] = res_astella.get("nota_descricao", "")
-            
-            # Extract points from analysis if possible (would need parsing, but nota is enough for now)
-            
-        except Exception as e:
-            console.print(f"[red]Erro Astella em {pdf_name}: {e}[/red]")
-            row_data["astella_score"] = "Erro"
-            row_data["astella_desc"] = str(e)
+    run_sync(_compare_all(pdf_files, evaluators, record))
 
-        results.append(row_data)
+    results = list(rows.values())
 
     # Display Comparison Table
     console.print("\n" + "=" * 80)
@@ -136,4 +165,8 @@ def run_comparison(pdf_folder="Inputs"):
     console.print(table)
 
 if __name__ == "__main__":
-    run_comparison()
+    parser = argparse.ArgumentParser(description="Compara as notas dos prompts V2 e Astella (V3)")
+    parser.add_argument('--folder', type=str, default="Inputs", help='Pasta contendo os PDFs (padrao: Inputs)')
+    parser.add_argument('--no-cache', action='store_true', help='Ignora o cache de respostas e reavalia do zero')
+    args = parser.parse_args()
+    run_comparison(args.folder, not args.no_cache)
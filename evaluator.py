@@ -3,28 +3,374 @@ Módulo de avaliação usando Pydantic AI.
 Suporta múltiplos modelos: Gemini e OpenAI.
 """
 
+import functools
+import hashlib
 import os
+import random
+import sys
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from itertools import repeat
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional, Union
 import logging
-import logfire
+import warnings
 
+import httpx
+import orjson
 from pydantic_ai import Agent, BinaryContent
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.models import Model, infer_model
 
+from cache import CacheBackend, DiskCache
 from config import NOTA_DESCRICOES
-from models import PitchDeckInfo, AvaliacaoStartup
-from model_config import get_model_config, ModelConfig, DEFAULT_MODEL
+from models import PitchDeckInfo, AvaliacaoStartup, PitchDeckAnalysis
+from model_config import get_model_config, get_extraction_model, ModelConfig, DEFAULT_MODEL
 from prompts import get_prompts, DEFAULT_PROMPT_VERSION
 
 # Configuração de Logger
 logger = logging.getLogger(__name__)
-logfire.configure(send_to_logfire='if-token-present')
-logfire.instrument_pydantic_ai()
 
+# Conversão de PDF para modelos sem suporte nativo a PDF
+TEXT_PAGE_MIN_CHARS = 200  # Páginas com mais texto que isso (e sem imagens) vão como texto
+TEXT_PAGE_MAX_DRAWINGS = 5  # Poucos vetores = elementos decorativos, não gráficos
+RENDER_ZOOM = 1.5
+RENDER_ZOOM_SMALL_PAGE = 2.0
+SMALL_PAGE_POINTS = 500  # Maior lado da página (em pontos) abaixo do qual ela é considerada pequena
+JPEG_QUALITY = 85  # Páginas com fotos vão como JPEG
+PARALLEL_RENDER_MIN_PAGES = 3  # Abaixo disso as páginas são renderizadas no próprio processo
+RENDER_CACHE_SIZE = 8  # PDFs convertidos mantidos em memória (por hash do conteúdo)
 
-@dataclass
+# Retry das chamadas ao LLM (apenas para erros transitórios)
+RETRY_ATTEMPTS = 3
+RETRY_MIN_WAIT = 4  # segundos
+RETRY_MAX_WAIT = 10
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Erros de rede/timeout que valem nova tentativa
+_TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (TimeoutError, ConnectionError, httpx.TransportError)
+
+# Número padrão de PDFs avaliados simultaneamente em evaluate_batch
+BATCH_CONCURRENCY = 8
+
+# Versão do formato das entradas de cache; incrementar quando o conteúdo enviado ao
+# LLM ou o formato das respostas mudar sem que os textos de prompt mudem
+# (2: estágio enviado e devolvido como valor, ex. "seed", e não "Estagio.SEED")
+CACHE_VERSION = 2
+
+# Batch API da OpenAI: janela de conclusão e desconto sobre o preço normal
+BATCH_API_WINDOW = "24h"
+BATCH_API_DISCOUNT = 0.5
+
+
+def _render_page(pdf_path: str, page_num: int) -> Union[str, BinaryContent]:
+    """
+    Converte uma página do PDF para envio ao LLM (executado em um processo do pool).
+    
+    Páginas só de texto são retornadas como texto (str), sem rasterização;
+    as demais são renderizadas como imagem: JPEG quando a página tem fotos/imagens
+    embutidas, PNG quando é só vetor/texto (gráficos, tabelas).
+    """
+    import fitz  # PyMuPDF
+    
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_num]
+        
+        text = page.get_text("text").strip()
+        has_images = bool(page.get_images())
+        if (
+            len(text) > TEXT_PAGE_MIN_CHARS
+            and not has_images
+            and len(page.get_drawings()) <= TEXT_PAGE_MAX_DRAWINGS
+        ):
+            return f"[Página {page_num + 1}]\n{text}"
+        
+        # Páginas pequenas mantêm a resolução maior para continuarem legíveis
+        zoom = RENDER_ZOOM_SMALL_PAGE if max(page.rect.width, page.rect.height) < SMALL_PAGE_POINTS else RENDER_ZOOM
+        image_format = "jpeg" if has_images else "png"
+        
+        try:
+            data = _rasterize_pdfium(pdf_path, page_num, zoom, image_format)
+        except ImportError:
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            if image_format == "jpeg":
+                data = pix.tobytes("jpeg", jpg_quality=JPEG_QUALITY)
+            else:
+                data = pix.tobytes("png")
+        
+        return BinaryContent(data=data, media_type=f"image/{image_format}")
+
+
+def _rasterize_pdfium(pdf_path: str, page_num: int, zoom: float, image_format: str) -> bytes:
+    """Renderiza a página com pypdfium2 (opcional, mais rápido que o PyMuPDF em páginas complexas)."""
+    import io
+    import pypdfium2
+    
+    pdf = pypdfium2.PdfDocument(pdf_path)
+    try:
+        image = pdf[page_num].render(scale=zoom).to_pil()
+    finally:
+        pdf.close()
+    
+    buf = io.BytesIO()
+    if image_format == "jpeg":
+        image.save(buf, format="JPEG", quality=JPEG_QUALITY)
+    else:
+        image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def _render_pool() -> ProcessPoolExecutor:
+    """
+    Pool de processos único para renderizar páginas, compartilhado por todos os PDFs.
+    
+    Em lote, vários PDFs são convertidos ao mesmo tempo; um pool por PDF subiria
+    cpu_count processos para cada um e pagaria o custo de inicialização toda vez.
+    
+    Usa "spawn": o pool é criado a partir de threads (asyncio.to_thread) com o
+    event loop do _LoopRunner rodando, e um fork nesse estado pode herdar locks
+    presos e travar o processo filho.
+    """
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_pdf(pdf_path: str, content_hash: str, max_pages: int) -> tuple[Union[str, BinaryContent], ...]:
+    """
+    Converte as páginas do PDF (até max_pages) em texto ou imagem, em paralelo.
+    
+    Memoizado pelo hash do conteúdo: avaliar o mesmo deck com outro prompt ou outro
+    avaliador no mesmo processo (comparativos, varreduras de prompts) não renderiza de novo.
+    """
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportError("PyMuPDF é necessário. pip install PyMuPDF")
+    
+    with fitz.open(pdf_path) as doc:
+        n_pages = min(len(doc), max_pages)
+    if n_pages == 0:
+        return ()
+    
+    # Em decks muito curtos despachar para o pool não compensa
+    if n_pages < PARALLEL_RENDER_MIN_PAGES or (os.cpu_count() or 1) == 1:
+        return tuple(map(_render_page, repeat(pdf_path), range(n_pages)))
+    
+    # PyMuPDF não é thread-safe: cada processo abre sua própria cópia do documento.
+    # map preserva a ordem das páginas.
+    pool = _render_pool()
+    try:
+        return tuple(pool.map(_render_page, repeat(pdf_path), range(n_pages)))
+    except BrokenProcessPool:
+        # Um worker morreu (crash/OOM): descarta o pool para que a próxima chamada
+        # crie outro e renderiza este PDF no próprio processo
+        logger.warning(f"Pool de renderização quebrado; renderizando {pdf_path} sem paralelismo")
+        if _render_pool() is pool:
+            _render_pool.cache_clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return tuple(map(_render_page, repeat(pdf_path), range(n_pages)))
+
+
+@functools.lru_cache(maxsize=None)
+def setup_observability() -> bool:
+    """
+    Configura o Logfire e instrumenta o PydanticAI (opcional, chamado pelos pontos de entrada).
+    
+    Só é ativado com LOGFIRE_TOKEN definido: sem token não há para onde enviar os traces,
+    e a instrumentação apenas adicionaria spans a cada chamada do LLM.
+    
+    Returns:
+        True se o Logfire estiver instalado e configurado
+    """
+    if not os.getenv("LOGFIRE_TOKEN"):
+        return False
+    try:
+        import logfire
+    except ImportError:
+        return False
+    
+    logfire.configure(send_to_logfire='if-token-present')
+    logfire.instrument_pydantic_ai()
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_model(model_string: str) -> Model:
+    """
+    Instância única do modelo por model_string.
+    
+    Agentes que usam o mesmo modelo (extração e avaliação, ou avaliadores diferentes
+    no compare_batch) compartilham o mesmo provider e, portanto, o mesmo cliente HTTP:
+    as conexões TCP/TLS abertas na primeira chamada são reaproveitadas nas seguintes.
+    """
+    return infer_model(model_string)
+
+
+@functools.lru_cache(maxsize=None)
+def _openai_client():
+    """Cliente síncrono da OpenAI para a Batch API (SDK importado só quando usado)."""
+    from openai import OpenAI
+    return OpenAI()
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Indica se o erro da chamada ao LLM é transitório (rate limit, 5xx, rede)."""
+    if isinstance(error, ModelHTTPError):
+        return error.status_code in RETRYABLE_STATUS
+    # O SDK da OpenAI (pesado) não é importado aqui: se ainda não foi carregado pelo
+    # provider, o erro não pode ser dele
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(error, openai.APIConnectionError):  # inclui APITimeoutError
+        return True
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+def _retry_wait(attempt: int) -> float:
+    """Backoff exponencial (4s, 8s, 10s...) com jitter."""
+    return min(RETRY_MAX_WAIT, RETRY_MIN_WAIT * 2 ** attempt) + random.uniform(0, 1)
+
+
+class _LoopRunner:
+    """
+    Event loop único, rodando em uma thread daemon, para as chamadas síncronas ao LLM.
+    
+    Evita criar e destruir um event loop a cada run_sync e mantém vivas as conexões
+    HTTP (TCP/TLS) do cliente assíncrono do provider entre uma chamada e outra.
+    """
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="startup-evaluator-loop", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+    
+    @classmethod
+    def run(cls, coro):
+        """Executa a corrotina no loop persistente e bloqueia até o resultado (propaga o contexto atual)."""
+        return asyncio.run_coroutine_threadsafe(coro, cls.get_loop()).result()
+
+
+def run_sync(coro):
+    """
+    Executa uma corrotina do avaliador (ex.: evaluate_batch) a partir de código síncrono.
+    
+    Use no lugar de asyncio.run: os clientes HTTP dos providers são compartilhados
+    (_shared_model) e ficam presos ao event loop em que foram usados pela primeira vez,
+    então todas as chamadas precisam rodar no mesmo loop do _LoopRunner.
+    """
+    return _LoopRunner.run(coro)
+
+
+def _text_hash(*parts: str) -> str:
+    """Hash curto de textos fixos (prompts), usado nas chaves de cache."""
+    return hashlib.sha256("".join(parts).encode()).hexdigest()[:8]
+
+
+def _settings_key(settings: dict) -> str:
+    """Representação estável das configurações de geração, para compor as chaves de cache."""
+    return repr(sorted(settings.items()))
+
+
+def _prompt_cache_settings(config: ModelConfig, system_prompt: str) -> dict:
+    """
+    Configurações para o cache de prefixo do provedor.
+    
+    O prompt de sistema (critérios, escala, instruções) é idêntico em todas as
+    chamadas e vem antes do conteúdo do PDF. O Gemini faz caching implícito desse
+    prefixo. A OpenAI só reaproveita o prefixo quando as requisições caem na mesma
+    máquina, e o prompt_cache_key faz esse roteamento.
+    """
+    if config.provider == "openai":
+        return {'openai_prompt_cache_key': f"startup-evaluator-{_text_hash(system_prompt)}"}
+    return {}
+
+
+def _content_key(path: str) -> str:
+    """Hash do conteúdo para deduplicar PDFs no lote (o próprio caminho se não der para ler)."""
+    try:
+        return _hash_file(path)
+    except OSError:
+        # O erro aparece na avaliação desse PDF, como nos demais casos de falha
+        return path
+
+
+def _copy_outcome(outcome):
+    """
+    Cópia rasa do resultado para um PDF duplicado, com uso zerado (como um acerto de
+    cache), para o custo do lote não ser contado duas vezes. Exceções são compartilhadas.
+    """
+    if not isinstance(outcome, dict):
+        return outcome
+    copy = dict(outcome)
+    if 'usage' in copy:
+        copy['usage'] = dict.fromkeys(copy['usage'], 0)
+    return copy
+
+
+def _new_file_digest():
+    """
+    Hash para identificar o conteúdo do PDF nas chaves de cache (não criptográfico).
+    
+    Usa xxh3-128 se o pacote xxhash estiver instalado (bem mais rápido em PDFs grandes);
+    senão, BLAKE2b da biblioteca padrão, que já é mais rápido que o SHA-256.
+    """
+    try:
+        import xxhash
+    except ImportError:
+        return hashlib.blake2b(digest_size=16)
+    return xxhash.xxh3_128()
+
+
+def _hash_file(path: str) -> str:
+    """
+    Hash do conteúdo do arquivo, memoizado por (caminho, tamanho, mtime).
+    
+    As chaves de cache (extração, passada única) e a conversão de páginas usam o hash
+    do mesmo PDF; assim o arquivo só é lido de novo se tiver sido modificado.
+    """
+    st = os.stat(path)
+    return _hash_file_version(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=256)
+def _hash_file_version(path: str, size: int, mtime_ns: int, chunk_size: int = 1 << 20) -> str:
+    """Calcula o hash do arquivo lendo em blocos (sem carregar o arquivo inteiro)."""
+    digest = _new_file_digest()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class _UsageCounters:
+    """Contadores mutáveis de uso de uma avaliação em andamento."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    requests: int = 0
+    cache_read_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+# Contadores de uso por avaliador (id) no contexto atual
+_usage_var: ContextVar[dict] = ContextVar("startup_evaluator_usage")
+
+
+@dataclass(slots=True)
 class UsageInfo:
     """Informações de uso da API."""
     input_tokens: int
@@ -32,33 +378,79 @@ class UsageInfo:
     total_tokens: int
     requests: int
     model_name: str
+    cache_read_tokens: int = 0
+    estimated_cost_usd: float = 0.0
     
     def __str__(self) -> str:
         return (
             f"Modelo: {self.model_name} | "
             f"Tokens: {self.total_tokens:,} "
             f"(input: {self.input_tokens:,}, output: {self.output_tokens:,}) | "
-            f"Requests: {self.requests}"
+            f"Requests: {self.requests} | "
+            f"Custo: ${self.estimated_cost_usd:.4f}"
         )
 
 
 class StartupEvaluator:
     """Avaliador de startups usando Pydantic AI com múltiplos modelos."""
     
+    __slots__ = (
+        'extraction_config', 'evaluation_config', 'extraction_model_name', 'evaluation_model_name',
+        'prompt_version', 'prompts', 'extraction_settings', 'evaluation_settings', 'cache',
+        '_extraction_rates', '_evaluation_rates',
+        'extraction_agent', 'evaluation_agent', 'multi_evaluation_agent', 'analysis_agent',
+        '_extraction_prompt_hash', '_evaluation_key_digest', '_single_pass_prompt_hash',
+        '_usage_key',
+    )
+    
+    # Prefixo de linha ("  - Rótulo: ") de cada campo do PitchDeckInfo no prompt de avaliação
+    _FIELD_LABELS = {field: f"  - {field.replace('_', ' ').title()}: " for field in PitchDeckInfo.model_fields}
+    
+    # Valores que o LLM usa para "não encontrado" (comparados em minúsculas)
+    _EMPTY_VALUES = frozenset({"indefinido", "desconhecido", "null", "none", ""})
+    
     def __init__(
         self, 
-        extraction_model: str = DEFAULT_MODEL, 
-        evaluation_model: str = DEFAULT_MODEL, 
-        prompt_version: str = DEFAULT_PROMPT_VERSION
+        extraction_model: Optional[str] = None, 
+        evaluation_model: Optional[str] = None, 
+        prompt_version: str = DEFAULT_PROMPT_VERSION,
+        single_pass: Optional[bool] = None,
+        cache: Optional[CacheBackend] = None,
+        model_name: Optional[str] = None
     ):
         """
         Inicializa o avaliador com modelos separados para extração e avaliação.
         
         Args:
-            extraction_model: Modelo para extração do PDF (ex: 'gemini-flash')
-            evaluation_model: Modelo para avaliação da startup (ex: 'gemini-pro')
+            extraction_model: Modelo para extração do PDF (ex: 'gemini-flash'). Por padrão (None),
+                usa o modelo mais barato do provedor do modelo de avaliação
+            evaluation_model: Modelo para avaliação da startup (ex: 'gemini-pro'). Por padrão (None),
+                usa o mesmo modelo da extração (ou DEFAULT_MODEL, se nenhum for informado)
             prompt_version: Versão do prompt a ser utilizada (ex: 'v1', 'v2', 'astella')
+            single_pass: Extrai e avalia em uma única chamada ao LLM. Por padrão (None),
+                é usado sempre que extração e avaliação usam o mesmo modelo
+            cache: Backend de cache das respostas do LLM (padrão: DiskCache em Outputs/.cache)
+            model_name: Obsoleto, equivale a extraction_model
         """
+        if model_name is not None:
+            warnings.warn(
+                "StartupEvaluator(model_name=...) está obsoleto; use extraction_model/evaluation_model.",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            if extraction_model is None:
+                extraction_model = model_name
+        
+        if evaluation_model is None:
+            evaluation_model = extraction_model or DEFAULT_MODEL
+        if extraction_model is None:
+            extraction_model = get_extraction_model(evaluation_model)
+            if extraction_model != evaluation_model:
+                logger.info(
+                    f"Extração com {extraction_model} (mais barato que {evaluation_model}). "
+                    f"Passe extraction_model explicitamente para usar outro modelo."
+                )
+        
         self.extraction_config = get_model_config(extraction_model)
         self.evaluation_config = get_model_config(evaluation_model)
         self.extraction_model_name = extraction_model
@@ -84,6 +476,9 @@ class StartupEvaluator:
         }
         if self.extraction_config.seed is not None:
             self.extraction_settings['seed'] = self.extraction_config.seed
+        self.extraction_settings.update(
+            _prompt_cache_settings(self.extraction_config, self.prompts.EXTRACTION_SYSTEM_PROMPT)
+        )
         
         # Configurações de geração para avaliação
         self.evaluation_settings = {
@@ -92,143 +487,342 @@ class StartupEvaluator:
         }
         if self.evaluation_config.seed is not None:
             self.evaluation_settings['seed'] = self.evaluation_config.seed
+        self.evaluation_settings.update(
+            _prompt_cache_settings(self.evaluation_config, self.prompts.get_evaluation_system_prompt())
+        )
+        
+        # Cache de respostas (só usado quando a geração é determinística)
+        self.cache = cache if cache is not None else DiskCache()
+        
+        # Preço por token (input, input em cache, output), calculado uma única vez
+        self._extraction_rates = self._token_rates(self.extraction_config)
+        self._evaluation_rates = self._token_rates(self.evaluation_config)
 
         # Agente para extração de informações do pitch deck
         self.extraction_agent = Agent(
-            self.extraction_config.model_string,
+            _shared_model(self.extraction_config.model_string),
             output_type=PitchDeckInfo,
             system_prompt=self.prompts.EXTRACTION_SYSTEM_PROMPT
         )
         
         # Agente para avaliação da startup
         self.evaluation_agent = Agent(
-            self.evaluation_config.model_string,
+            _shared_model(self.evaluation_config.model_string),
             output_type=AvaliacaoStartup,
             system_prompt=self.prompts.get_evaluation_system_prompt()
         )
         
+        # Agente para avaliar várias startups em uma única chamada (evaluate_batch com coalesce)
+        self.multi_evaluation_agent = Agent(
+            _shared_model(self.evaluation_config.model_string),
+            output_type=list[AvaliacaoStartup],
+            system_prompt=self.prompts.get_evaluation_system_prompt()
+        )
+        
+        # Partes fixas das chaves de cache, calculadas uma única vez. Incluem as
+        # configurações de geração: mudar temperature/top_p/seed invalida o cache
+        self._extraction_prompt_hash = _text_hash(
+            str(CACHE_VERSION), self.prompts.EXTRACTION_SYSTEM_PROMPT, self.prompts.EXTRACTION_USER_PROMPT,
+            _settings_key(self.extraction_settings)
+        )
+        self._evaluation_key_digest = hashlib.sha256()
+        for part in (
+            str(CACHE_VERSION),
+            self.evaluation_config.model_string,
+            self.prompts.get_evaluation_system_prompt(),
+            _settings_key(self.evaluation_settings)
+        ):
+            self._evaluation_key_digest.update(part.encode())
+            self._evaluation_key_digest.update(b"\0")
+        
+        # Agente de passada única (extração + avaliação na mesma chamada)
+        self.analysis_agent = None
+        same_model = extraction_model == evaluation_model
+        if single_pass is None:
+            single_pass = same_model
+        if single_pass:
+            if same_model:
+                self.analysis_agent = Agent(
+                    _shared_model(self.evaluation_config.model_string),
+                    output_type=PitchDeckAnalysis,
+                    system_prompt=self.prompts.get_single_pass_system_prompt()
+                )
+                self._single_pass_prompt_hash = _text_hash(
+                    str(CACHE_VERSION), self.prompts.get_single_pass_system_prompt(), self.prompts.get_single_pass_user_prompt(),
+                    _settings_key(self.evaluation_settings)
+                )
+            else:
+                logger.warning("single_pass ignorado: extração e avaliação usam modelos diferentes.")
+        
         logger.info(
             f"Evaluator inicializado | "
             f"Extração: {extraction_model} | "
             f"Avaliação: {evaluation_model} | "
-            f"Prompt: {prompt_version}"
+            f"Prompt: {prompt_version} | "
+            f"Passada única: {self.analysis_agent is not None}"
         )
         
-        # Tracking de uso
-        self._total_input_tokens = 0
-        self._total_output_tokens = 0
-        self._total_requests = 0
+        # Tracking de uso: contadores isolados por contexto (thread ou task asyncio),
+        # para permitir avaliações concorrentes com o mesmo avaliador
+        self._usage_key = id(self)
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        reraise=True
-    )
     def _run_agent_sync(self, agent: Agent, content, model_settings: dict):
-        """Executa agente com retry automático e configurações de modelo."""
-        try:
-            return agent.run_sync(content, model_settings=model_settings)
-        except TypeError:
-            logger.warning("Versão do PydanticAI não suporta model_settings em run_sync. Usando defaults.")
-            return agent.run_sync(content)
-        except Exception as e:
-            logger.warning(f"Erro na chamada do LLM (tentativa de retry): {e}")
-            raise e
-
-    def _track_usage(self, usage) -> None:
-        """Acumula uso de tokens."""
+        """Executa agente com configurações de modelo, repetindo em erros transitórios."""
+        # Roda no event loop persistente: o pool de conexões do provider sobrevive entre chamadas
+        return _LoopRunner.run(self._run_agent(agent, content, model_settings))
+
+    async def _run_agent(self, agent: Agent, content, model_settings: dict):
+        """Executa agent.run no event loop atual, repetindo em erros transitórios."""
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                try:
+                    return await agent.run(content, model_settings=model_settings)
+                except TypeError:
+                    logger.warning("Versão do PydanticAI não suporta model_settings em run. Usando defaults.")
+                    return await agent.run(content)
+            except Exception as e:
+                if not _is_transient(e) or attempt == RETRY_ATTEMPTS - 1:
+                    raise
+                wait = _retry_wait(attempt)
+                logger.warning(f"Erro transitório na chamada do LLM, nova tentativa em {wait:.1f}s: {e}")
+                await asyncio.sleep(wait)
+
+    def _usage_counters(self) -> "_UsageCounters":
+        """Retorna os contadores de uso do contexto atual, inicializando se necessário."""
+        counters = _usage_var.get({}).get(self._usage_key)
+        if counters is None:
+            counters = self._new_usage_counters()
+        return counters
+
+    def _new_usage_counters(self) -> "_UsageCounters":
+        """Associa contadores zerados a este avaliador no contexto atual."""
+        counters = _UsageCounters()
+        # Copia o mapa para não alterar o de contextos pais (tasks/threads concorrentes)
+        state = dict(_usage_var.get({}))
+        state[self._usage_key] = counters
+        _usage_var.set(state)
+        return counters
+
+    @staticmethod
+    def _token_rates(config) -> tuple[float, float, float]:
+        """Converte o preço por 1M tokens do modelo em preço por token (input, input em cache, output)."""
+        pricing = config.pricing
+        input_rate = pricing.input_per_million / 1_000_000
+        return (
+            input_rate,
+            input_rate * pricing.cached_input_multiplier,
+            pricing.output_per_million / 1_000_000,
+        )
+    
+    @staticmethod
+    def _calculate_cost(
+        input_tokens: int, cache_read_tokens: int, output_tokens: int, rates: tuple[float, float, float]
+    ) -> float:
+        """Calcula o custo estimado em USD de uma chamada (input_tokens inclui os tokens lidos do cache)."""
+        input_rate, cached_rate, output_rate = rates
+        return (
+            (input_tokens - cache_read_tokens) * input_rate
+            + cache_read_tokens * cached_rate
+            + output_tokens * output_rate
+        )
+    
+    def _track_usage(self, usage, rates: tuple[float, float, float]) -> None:
+        """Acumula uso de tokens e custo estimado."""
         if usage:
-            self._total_input_tokens += usage.input_tokens or 0
-            self._total_output_tokens += usage.output_tokens or 0
-            self._total_requests += usage.requests or 0
+            input_tokens = usage.input_tokens or 0
+            cache_read_tokens = getattr(usage, 'cache_read_tokens', 0) or 0
+            output_tokens = usage.output_tokens or 0
+            counters = self._usage_counters()
+            counters.input_tokens += input_tokens
+            counters.output_tokens += output_tokens
+            counters.requests += usage.requests or 0
+            counters.cache_read_tokens += cache_read_tokens
+            counters.cost_usd += self._calculate_cost(input_tokens, cache_read_tokens, output_tokens, rates)
     
     def get_usage(self) -> UsageInfo:
         """Retorna informações de uso acumulado."""
+        counters = self._usage_counters()
         return UsageInfo(
-            input_tokens=self._total_input_tokens,
-            output_tokens=self._total_output_tokens,
-            total_tokens=self._total_input_tokens + self._total_output_tokens,
-            requests=self._total_requests,
-            model_name=f"{self.extraction_config.name} / {self.evaluation_config.name}"
+            input_tokens=counters.input_tokens,
+            output_tokens=counters.output_tokens,
+            total_tokens=counters.input_tokens + counters.output_tokens,
+            requests=counters.requests,
+            model_name=f"{self.extraction_config.name} / {self.evaluation_config.name}",
+            cache_read_tokens=counters.cache_read_tokens,
+            estimated_cost_usd=counters.cost_usd
         )
     
     def reset_usage(self) -> None:
         """Reseta o tracking de uso."""
-        self._total_input_tokens = 0
-        self._total_output_tokens = 0
-        self._total_requests = 0
+        self._new_usage_counters()
     
     def extract_info(self, pdf_path: str) -> PitchDeckInfo:
         """Extrai informações do pitch deck."""
+        cache_key, cached = self._lookup_extraction(pdf_path)
+        if cached is not None:
+            return cached
+        
+        content = self._extraction_content(pdf_path)
+        result = self._run_agent_sync(self.extraction_agent, content, self.extraction_settings)
+        return self._finish_extraction(pdf_path, cache_key, result)
+    
+    async def extract_info_async(self, pdf_path: str) -> PitchDeckInfo:
+        """Versão assíncrona de extract_info."""
+        cache_key, cached = await asyncio.to_thread(self._lookup_extraction, pdf_path)
+        if cached is not None:
+            return cached
+        
+        # Leitura do PDF e rasterização são bloqueantes: rodam fora do event loop
+        content = await asyncio.to_thread(self._extraction_content, pdf_path)
+        result = await self._run_agent(self.extraction_agent, content, self.extraction_settings)
+        return self._finish_extraction(pdf_path, cache_key, result)
+    
+    def _lookup_extraction(self, pdf_path: str) -> tuple[Optional[str], Optional[PitchDeckInfo]]:
+        """Retorna a chave de cache da extração e o resultado cacheado, se houver."""
         logger.info(f"Iniciando extração de informações: {pdf_path} (modelo: {self.extraction_config.name})")
-        pdf_bytes = Path(pdf_path).read_bytes()
+        if not self._is_deterministic(self.extraction_config):
+            return None, None
+        
+        cache_key = self._extraction_cache_key(pdf_path)
+        cached = self._load_cached(cache_key, PitchDeckInfo)
+        if cached is not None:
+            logger.info(f"Extração reaproveitada do cache: {cache_key}")
+        return cache_key, cached
+    
+    def _extraction_content(self, pdf_path: str, user_prompt: Optional[str] = None) -> list:
+        """Monta o conteúdo (prompt + PDF ou páginas) enviado ao agente de extração."""
+        if user_prompt is None:
+            user_prompt = self.prompts.EXTRACTION_USER_PROMPT
         
         if self.extraction_config.supports_pdf:
-            content = [
-                self.prompts.EXTRACTION_USER_PROMPT,
+            # Os bytes só são carregados quando a extração de fato precisa rodar
+            pdf_bytes = Path(pdf_path).read_bytes()
+            return [
+                user_prompt,
                 BinaryContent(data=pdf_bytes, media_type='application/pdf')
             ]
-            result = self._run_agent_sync(self.extraction_agent, content, self.extraction_settings)
-        else:
-            logger.info("Convertendo PDF para imagens (modelo não suporta PDF nativo)...")
-            images = self._pdf_to_images(pdf_path)
-            content = [self.prompts.EXTRACTION_USER_PROMPT]
-            for img_bytes in images:
-                content.append(BinaryContent(data=img_bytes, media_type='image/png'))
-            result = self._run_agent_sync(self.extraction_agent, content, self.extraction_settings)
         
-        self._track_usage(result.usage())
+        logger.info("Convertendo PDF para texto/imagens (modelo não suporta PDF nativo)...")
+        content = [user_prompt]
+        content.extend(self._pdf_to_content(pdf_path))
+        return content
+    
+    def _finish_extraction(self, pdf_path: str, cache_key: Optional[str], result) -> PitchDeckInfo:
+        """Contabiliza o uso, valida e grava a extração no cache."""
+        self._track_usage(result.usage(), self._extraction_rates)
         
-        if not self._validate_extraction(result.output):
+        if self._validate_extraction(result.output):
+            self._save_cached(cache_key, result.output)
+        else:
             logger.warning(f"Extração de baixa qualidade para {pdf_path}")
             
         return result.output
     
+    @staticmethod
+    def _is_deterministic(config: ModelConfig) -> bool:
+        """Só vale a pena cachear respostas de gerações reprodutíveis."""
+        return config.temperature == 0 or config.seed is not None
+    
+    def _extraction_cache_key(self, pdf_path: str) -> str:
+        """Chave de cache da extração: conteúdo do PDF + modelo + prompts de extração."""
+        pdf_hash = _hash_file(pdf_path)[:16]
+        return f"{pdf_hash}_{self.extraction_model_name}_{self._extraction_prompt_hash}"
+    
+    def _evaluation_cache_key(self, prompt: str) -> str:
+        """Chave de cache da avaliação: modelo + prompts de avaliação (que já incluem o resumo do PDF)."""
+        digest = self._evaluation_key_digest.copy()
+        digest.update(prompt.encode())
+        return f"eval_{digest.hexdigest()[:24]}_{self.evaluation_model_name}_{self.prompt_version}"
+    
+    def _load_cached(self, cache_key: str, model_cls):
+        """Carrega uma saída do cache, se existir e for válida para o modelo pydantic informado."""
+        data = self.cache.get(cache_key)
+        if data is None:
+            return None
+        try:
+            return model_cls.model_validate_json(data)
+        except ValueError as e:
+            logger.warning(f"Entrada de cache inválida ({cache_key}): {e}")
+            return None
+    
+    def _save_cached(self, cache_key: Optional[str], output) -> None:
+        """Grava uma saída no cache (no-op quando a chamada não é cacheável)."""
+        if cache_key is not None:
+            self.cache.set(cache_key, output.model_dump_json().encode())
+    
     def _validate_extraction(self, info: PitchDeckInfo) -> bool:
         """Verifica se a extração obteve informações mínimas."""
-        has_name = info.nome_startup and info.nome_startup.lower() not in ["indefinido", "desconhecido", "null", "none"]
+        empty = self._EMPTY_VALUES
+        has_name = bool(info.nome_startup) and info.nome_startup.lower() not in empty
         
+        # getattr direto nos campos evita montar o dict do model_dump()
         filled_fields = 0
-        for field, value in info.model_dump().items():
-            if value and str(value).lower() not in ["indefinido", "desconhecido", "null", "none"]:
-                filled_fields += 1
-                
-        is_valid = has_name and filled_fields >= 3
-        if not is_valid:
-            logger.warning(f"Validação de extração falhou. Nome: {info.nome_startup}, Campos preenchidos: {filled_fields}")
-        
-        return is_valid
-    
-    def _pdf_to_images(self, pdf_path: str, max_pages: int = 10) -> list[bytes]:
-        """Converte PDF em imagens."""
-        try:
-            import fitz  # PyMuPDF
-        except ImportError:
-            raise ImportError("PyMuPDF é necessário. pip install PyMuPDF")
+        for field in PitchDeckInfo.model_fields:
+            value = getattr(info, field)
+            if not value or (isinstance(value, str) and value.lower() in empty):
+                continue
+            filled_fields += 1
+            if has_name and filled_fields >= 3:
+                return True
         
-        images = []
-        doc = fitz.open(pdf_path)
+        logger.warning(f"Validação de extração falhou. Nome: {info.nome_startup}, Campos preenchidos: {filled_fields}")
+        return False
+    
+    def _pdf_to_content(self, pdf_path: str, max_pages: int = 10) -> tuple[Union[str, BinaryContent], ...]:
+        """Converte PDF em texto (páginas só de texto) ou imagens PNG/JPEG, processando as páginas em paralelo."""
+        return _render_pdf(pdf_path, _hash_file(pdf_path), max_pages)
+    
+    def evaluate_startup(self, pdf_info: PitchDeckInfo, info_dict: Optional[dict] = None) -> AvaliacaoStartup:
+        """
+        Avalia a startup com base nas informações extraídas.
         
-        for page_num in range(min(len(doc), max_pages)):
-            page = doc[page_num]
-            mat = fitz.Matrix(2.0, 2.0)
-            pix = page.get_pixmap(matrix=mat)
-            images.append(pix.tobytes("png"))
+        Args:
+            pdf_info: Informações extraídas do pitch deck
+            info_dict: pdf_info.model_dump() já calculado, para evitar serializar duas vezes
+        """
+        prompt = self._evaluation_prompt(pdf_info, info_dict)
+        cache_key, cached = self._lookup_evaluation(prompt)
+        if cached is not None:
+            return cached
         
-        doc.close()
-        return images
+        result = self._run_agent_sync(self.evaluation_agent, prompt, self.evaluation_settings)
+        return self._finish_evaluation(cache_key, result)
     
-    def evaluate_startup(self, pdf_info: PitchDeckInfo) -> AvaliacaoStartup:
-        """Avalia a startup com base nas informações extraídas."""
-        logger.info(f"Iniciando avaliação da startup: {pdf_info.nome_startup} (modelo: {self.evaluation_config.name})")
-        pdf_summary = self._format_pdf_info(pdf_info)
-        prompt = self.prompts.get_evaluation_user_prompt(pdf_summary)
+    async def evaluate_startup_async(self, pdf_info: PitchDeckInfo, info_dict: Optional[dict] = None) -> AvaliacaoStartup:
+        """Versão assíncrona de evaluate_startup."""
+        prompt = self._evaluation_prompt(pdf_info, info_dict)
+        cache_key, cached = await asyncio.to_thread(self._lookup_evaluation, prompt)
+        if cached is not None:
+            return cached
         
-        result = self._run_agent_sync(self.evaluation_agent, prompt, self.evaluation_settings)
-        self._track_usage(result.usage())
+        result = await self._run_agent(self.evaluation_agent, prompt, self.evaluation_settings)
+        return self._finish_evaluation(cache_key, result)
+    
+    def _lookup_evaluation(self, prompt: str) -> tuple[Optional[str], Optional[AvaliacaoStartup]]:
+        """Retorna a chave de cache da avaliação e o resultado cacheado, se houver."""
+        if not self._is_deterministic(self.evaluation_config):
+            return None, None
         
+        cache_key = self._evaluation_cache_key(prompt)
+        cached = self._load_cached(cache_key, AvaliacaoStartup)
+        if cached is not None:
+            logger.info(f"Avaliação reaproveitada do cache: {cache_key}")
+        return cache_key, cached
+    
+    def _finish_evaluation(self, cache_key: Optional[str], result) -> AvaliacaoStartup:
+        """Contabiliza o uso e grava a avaliação no cache."""
+        self._track_usage(result.usage(), self._evaluation_rates)
+        self._save_cached(cache_key, result.output)
         return result.output
     
+    def _evaluation_prompt(self, pdf_info: PitchDeckInfo, info_dict: Optional[dict]) -> str:
+        """Monta o prompt de avaliação a partir das informações extraídas."""
+        logger.info(f"Iniciando avaliação da startup: {pdf_info.nome_startup} (modelo: {self.evaluation_config.name})")
+        if info_dict is None:
+            info_dict = pdf_info.model_dump()
+        pdf_summary = self._format_pdf_info(info_dict)
+        return self.prompts.get_evaluation_user_prompt(pdf_summary)
+    
     def _validate_evaluation_consistency(self, avaliacao: AvaliacaoStartup) -> None:
         """Valida consistência da avaliação."""
         criterios = avaliacao.criterios_atendidos
@@ -256,29 +850,389 @@ class StartupEvaluator:
                 f"critérios críticos atendidos. Revisar avaliação."
             )
     
-    def _format_pdf_info(self, info: PitchDeckInfo) -> str:
-        """Formata as informações do PDF para o prompt."""
-        lines = []
-        for field_name, field_value in info.model_dump().items():
-            if field_value and field_value != "indefinido":
-                label = field_name.replace('_', ' ').title()
-                lines.append(f"  - {label}: {field_value}")
+    def _format_pdf_info(self, info_dict: dict) -> str:
+        """Formata as informações do PDF (PitchDeckInfo.model_dump()) para o prompt."""
+        labels = self._FIELD_LABELS
+        lines = [
+            f"{labels[field_name]}{field_value}"
+            for field_name, field_value in info_dict.items()
+            if field_value and field_value != "indefinido"
+        ]
         return "\n".join(lines) if lines else "  - Nenhuma informação extraída"
     
     def evaluate(self, pdf_path: str) -> dict:
         """Realiza avaliação completa da startup."""
         self.reset_usage()
         
+        if self.analysis_agent is not None:
+            cache_key, cached = self._lookup_single_pass(pdf_path)
+            if cached is not None:
+                return self._build_result(cached.info, cached.info.model_dump(), cached.avaliacao)
+            
+            content = self._single_pass_content(pdf_path)
+            result = self._run_agent_sync(self.analysis_agent, content, self.evaluation_settings)
+            return self._finish_single_pass(pdf_path, cache_key, result)
+        
         pdf_info = self.extract_info(pdf_path)
-        avaliacao = self.evaluate_startup(pdf_info)
+        return self._evaluate_from_info(pdf_info)
+    
+    async def evaluate_async(self, pdf_path: str) -> dict:
+        """Versão assíncrona de evaluate, para rodar várias avaliações concorrentemente."""
+        self.reset_usage()
         
-        self._validate_evaluation_consistency(avaliacao)
+        if self.analysis_agent is not None:
+            cache_key, cached = await asyncio.to_thread(self._lookup_single_pass, pdf_path)
+            if cached is not None:
+                return self._build_result(cached.info, cached.info.model_dump(), cached.avaliacao)
+            
+            content = await asyncio.to_thread(self._single_pass_content, pdf_path)
+            result = await self._run_agent(self.analysis_agent, content, self.evaluation_settings)
+            return self._finish_single_pass(pdf_path, cache_key, result)
+        
+        pdf_info = await self.extract_info_async(pdf_path)
+        info_dict = pdf_info.model_dump()
+        avaliacao = await self.evaluate_startup_async(pdf_info, info_dict)
+        return self._build_result(pdf_info, info_dict, avaliacao)
+    
+    async def evaluate_batch(
+        self,
+        pdf_paths: list[str],
+        concurrency: int = BATCH_CONCURRENCY,
+        coalesce: int = 1,
+        on_done: Optional[Callable[[str, object], None]] = None
+    ) -> list:
+        """
+        Avalia vários pitch decks concorrentemente, com até `concurrency` PDFs em andamento.
+        
+        Com `coalesce` > 1, os PDFs são agrupados de `coalesce` em `coalesce`: cada grupo é
+        extraído normalmente e avaliado em uma única chamada ao LLM (o prompt de sistema,
+        a maior parte dos tokens de input, é enviado uma vez por grupo). Nesse modo
+        `concurrency` limita o número de grupos em andamento.
+        
+        `on_done(pdf_path, resultado)`, se informado, é chamado assim que cada PDF é
+        concluído (o resultado é a exceção em caso de falha), por exemplo para
+        avançar uma barra de progresso ou gravar o resultado em disco.
+        
+        PDFs com conteúdo idêntico (cópias com outro nome) são avaliados uma única vez
+        e o resultado é replicado para cada um deles.
+        
+        Retorna os resultados na ordem de `pdf_paths`; falhas aparecem como a exceção
+        correspondente na lista, sem interromper as demais avaliações.
+        """
+        hashes = await asyncio.gather(*(asyncio.to_thread(_content_key, p) for p in pdf_paths))
+        representatives: dict[str, str] = {}
+        owners = [representatives.setdefault(h, p) for h, p in zip(hashes, pdf_paths)]
+        copies: dict[str, list[str]] = {}
+        for pdf_path, owner in zip(pdf_paths, owners):
+            copies.setdefault(owner, []).append(pdf_path)
+        unique_paths = list(representatives.values())
+        if len(unique_paths) < len(pdf_paths):
+            logger.info(f"{len(pdf_paths) - len(unique_paths)} PDFs duplicados no lote serão avaliados uma única vez")
+        
+        def fan_out(pdf_path: str, outcome) -> None:
+            for i, copy_path in enumerate(copies[pdf_path]):
+                on_done(copy_path, outcome if i == 0 else _copy_outcome(outcome))
+        
+        outcomes = await self._evaluate_unique(unique_paths, concurrency, coalesce, fan_out if on_done else None)
+        by_owner = dict(zip(unique_paths, outcomes))
+        return [
+            by_owner[owner] if pdf_path == owner else _copy_outcome(by_owner[owner])
+            for pdf_path, owner in zip(pdf_paths, owners)
+        ]
+    
+    async def _evaluate_unique(
+        self,
+        pdf_paths: list[str],
+        concurrency: int,
+        coalesce: int,
+        on_done: Optional[Callable[[str, object], None]]
+    ) -> list:
+        """Avalia PDFs distintos concorrentemente (ver evaluate_batch)."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        if coalesce > 1:
+            groups = [pdf_paths[i:i + coalesce] for i in range(0, len(pdf_paths), coalesce)]
+            
+            async def group(paths: list[str]) -> list:
+                async with semaphore:
+                    try:
+                        outcomes = await self._evaluate_group_async(paths)
+                    except Exception as e:
+                        outcomes = [e] * len(paths)
+                if on_done is not None:
+                    for pdf_path, outcome in zip(paths, outcomes):
+                        on_done(pdf_path, outcome)
+                return outcomes
+            
+            outcomes = await asyncio.gather(*(group(g) for g in groups))
+            return [outcome for group_outcomes in outcomes for outcome in group_outcomes]
+        
+        async def one(pdf_path: str) -> dict:
+            async with semaphore:
+                try:
+                    outcome = await self.evaluate_async(pdf_path)
+                except Exception as e:
+                    outcome = e
+            if on_done is not None:
+                on_done(pdf_path, outcome)
+            return outcome
+        
+        return await asyncio.gather(*(one(p) for p in pdf_paths), return_exceptions=True)
+    
+    async def _evaluate_group_async(self, pdf_paths: list[str]) -> list:
+        """Extrai os PDFs do grupo e os avalia em uma única chamada; falhas de extração vão na lista."""
+        self.reset_usage()
+        
+        infos = await asyncio.gather(*(self.extract_info_async(p) for p in pdf_paths), return_exceptions=True)
+        extracted = [i for i, info in enumerate(infos) if not isinstance(info, BaseException)]
+        if not extracted:
+            return infos
+        
+        pdf_infos = [infos[i] for i in extracted]
+        info_dicts = [info.model_dump() for info in pdf_infos]
+        avaliacoes = await self.evaluate_startups_async(pdf_infos, info_dicts)
+        
+        # O uso do grupo (extrações + avaliação conjunta) é rateado entre os resultados
+        shares = self._split_usage(len(extracted))
+        results = list(infos)
+        for i, pdf_info, info_dict, avaliacao, usage in zip(extracted, pdf_infos, info_dicts, avaliacoes, shares):
+            results[i] = self._build_result(pdf_info, info_dict, avaliacao, usage)
+        return results
+    
+    async def evaluate_startups_async(
+        self, pdf_infos: list[PitchDeckInfo], info_dicts: Optional[list[dict]] = None
+    ) -> list[AvaliacaoStartup]:
+        """Avalia várias startups em uma única chamada ao LLM, na ordem de `pdf_infos`."""
+        if info_dicts is None:
+            info_dicts = [info.model_dump() for info in pdf_infos]
+        if len(pdf_infos) <= 1:
+            return [await self.evaluate_startup_async(info, d) for info, d in zip(pdf_infos, info_dicts)]
         
+        logger.info(f"Iniciando avaliação conjunta de {len(pdf_infos)} startups (modelo: {self.evaluation_config.name})")
+        prompt = self.prompts.get_multi_evaluation_user_prompt([self._format_pdf_info(d) for d in info_dicts])
+        result = await self._run_agent(self.multi_evaluation_agent, prompt, self.evaluation_settings)
+        self._track_usage(result.usage(), self._evaluation_rates)
+        
+        if len(result.output) != len(pdf_infos):
+            logger.warning(
+                f"Avaliação conjunta retornou {len(result.output)} avaliações para {len(pdf_infos)} startups. "
+                f"Avaliando individualmente."
+            )
+            return list(await asyncio.gather(
+                *(self.evaluate_startup_async(info, d) for info, d in zip(pdf_infos, info_dicts))
+            ))
+        return result.output
+    
+    # --- Batch API da OpenAI (50% do custo, resultados em até 24h) ---
+    
+    def _require_batch_api(self) -> None:
+        """Valida que a configuração atual pode usar a Batch API."""
+        if not self.evaluation_config.supports_batch_api:
+            raise ValueError(f"{self.evaluation_config.name} não suporta a Batch API.")
+        if self.analysis_agent is None:
+            raise ValueError("A Batch API exige passada única (mesmo modelo para extração e avaliação).")
+    
+    def _batch_request(self, pdf_path: str) -> dict:
+        """Monta a linha do JSONL da Batch API para um PDF (mesmo conteúdo da passada única)."""
+        parts = []
+        for item in self._single_pass_content(pdf_path):
+            if isinstance(item, BinaryContent):
+                parts.append({"type": "image_url", "image_url": {"url": item.data_uri}})
+            else:
+                parts.append({"type": "text", "text": item})
+        
+        body = {
+            "model": self.evaluation_config.model_string.rpartition(":")[2],
+            "messages": [
+                {"role": "system", "content": self.prompts.get_single_pass_system_prompt()},
+                {"role": "user", "content": parts},
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "PitchDeckAnalysis", "schema": PitchDeckAnalysis.model_json_schema()},
+            },
+        }
+        # Só parâmetros aceitos por todos os modelos da Batch API: os GPT-5 são modelos
+        # de raciocínio e recusam (400) temperature/top_p diferentes do padrão
+        cache_key = self.evaluation_settings.get('openai_prompt_cache_key')
+        if cache_key:
+            body["prompt_cache_key"] = cache_key
+        return {"custom_id": Path(pdf_path).name, "method": "POST", "url": "/v1/chat/completions", "body": body}
+    
+    def submit_batch(self, pdf_paths: list[str]) -> str:
+        """
+        Envia os PDFs como um job da Batch API da OpenAI e retorna o id do batch.
+        
+        Cada PDF vira uma requisição identificada pelo nome do arquivo (custom_id).
+        Os resultados são obtidos depois com collect_batch.
+        """
+        self._require_batch_api()
+        
+        lines = [orjson.dumps(self._batch_request(p)) for p in pdf_paths]
+        client = _openai_client()
+        batch_file = client.files.create(file=("batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_API_WINDOW
+        )
+        logger.info(f"Batch {batch.id} enviado com {len(pdf_paths)} PDFs (modelo: {self.evaluation_config.name})")
+        return batch.id
+    
+    @staticmethod
+    def batch_status(batch_id: str):
+        """Retorna o objeto Batch da OpenAI (status, request_counts, ...)."""
+        return _openai_client().batches.retrieve(batch_id)
+    
+    def collect_batch(self, batch_id: str) -> dict:
+        """
+        Baixa os resultados de um batch concluído.
+        
+        Retorna {custom_id (nome do PDF): resultado}; requisições com erro aparecem
+        como a exceção correspondente, como em evaluate_batch.
+        """
+        self._require_batch_api()
+        
+        batch = self.batch_status(batch_id)
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch_id} ainda não concluído (status: {batch.status}).")
+        
+        client = _openai_client()
+        outcomes = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id is None:
+                continue
+            for line in client.files.content(file_id).text.splitlines():
+                if line:
+                    entry = orjson.loads(line)
+                    outcomes[entry["custom_id"]] = self._batch_outcome(entry)
+        return outcomes
+    
+    def _batch_outcome(self, entry: dict):
+        """Converte uma linha do arquivo de saída da Batch API em resultado (ou exceção)."""
+        response = entry.get("response") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            error = entry.get("error") or response.get("body", {}).get("error")
+            return RuntimeError(f"Requisição falhou no batch: {error}")
+        
+        body = response["body"]
+        try:
+            analysis = PitchDeckAnalysis.model_validate_json(body["choices"][0]["message"]["content"])
+        except ValueError as e:
+            return e
+        
+        tokens = body.get("usage") or {}
+        input_tokens = tokens.get("prompt_tokens", 0)
+        output_tokens = tokens.get("completion_tokens", 0)
+        cache_read_tokens = (tokens.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+        cost = self._calculate_cost(input_tokens, cache_read_tokens, output_tokens, self._evaluation_rates)
+        usage = UsageInfo(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            requests=1,
+            model_name=self.evaluation_config.name,
+            cache_read_tokens=cache_read_tokens,
+            estimated_cost_usd=cost * BATCH_API_DISCOUNT
+        )
+        return self._build_result(analysis.info, analysis.info.model_dump(), analysis.avaliacao, usage)
+    
+    def evaluate_from_info(self, pdf_info: PitchDeckInfo) -> dict:
+        """
+        Realiza a avaliação a partir de informações já extraídas do pitch deck.
+        
+        A extração não depende da versão do prompt de avaliação, então o mesmo
+        PitchDeckInfo pode ser reaproveitado por avaliadores diferentes.
+        """
+        self.reset_usage()
+        return self._evaluate_from_info(pdf_info)
+    
+    async def evaluate_from_info_async(self, pdf_info: PitchDeckInfo) -> dict:
+        """Versão assíncrona de evaluate_from_info."""
+        self.reset_usage()
+        
+        info_dict = pdf_info.model_dump()
+        avaliacao = await self.evaluate_startup_async(pdf_info, info_dict)
+        return self._build_result(pdf_info, info_dict, avaliacao)
+    
+    def _evaluate_from_info(self, pdf_info: PitchDeckInfo) -> dict:
+        """Avalia a startup e monta o resultado final (sem resetar o uso)."""
+        info_dict = pdf_info.model_dump()
+        avaliacao = self.evaluate_startup(pdf_info, info_dict)
+        return self._build_result(pdf_info, info_dict, avaliacao)
+    
+    def _lookup_single_pass(self, pdf_path: str) -> tuple[Optional[str], Optional[PitchDeckAnalysis]]:
+        """Retorna a chave de cache da chamada única e o resultado cacheado, se houver."""
+        logger.info(f"Iniciando análise em passada única: {pdf_path} (modelo: {self.evaluation_config.name})")
+        if not self._is_deterministic(self.evaluation_config):
+            return None, None
+        
+        cache_key = (
+            f"full_{_hash_file(pdf_path)[:16]}_{self.evaluation_model_name}_"
+            f"{self.prompt_version}_{self._single_pass_prompt_hash}"
+        )
+        cached = self._load_cached(cache_key, PitchDeckAnalysis)
+        if cached is not None:
+            logger.info(f"Análise reaproveitada do cache: {cache_key}")
+        return cache_key, cached
+    
+    def _single_pass_content(self, pdf_path: str) -> list:
+        """Monta o conteúdo da chamada única (extração + avaliação)."""
+        return self._extraction_content(pdf_path, self.prompts.get_single_pass_user_prompt())
+    
+    def _finish_single_pass(self, pdf_path: str, cache_key: Optional[str], result) -> dict:
+        """Contabiliza o uso, grava no cache e monta o resultado da chamada única."""
+        self._track_usage(result.usage(), self._evaluation_rates)
+        
+        analysis = result.output
+        if self._validate_extraction(analysis.info):
+            self._save_cached(cache_key, analysis)
+        else:
+            logger.warning(f"Extração de baixa qualidade para {pdf_path}")
+        
+        return self._build_result(analysis.info, analysis.info.model_dump(), analysis.avaliacao)
+    
+    def _split_usage(self, n: int) -> list[UsageInfo]:
+        """
+        Uso acumulado no contexto atual rateado entre n resultados.
+        
+        Os restos das divisões inteiras vão para os primeiros resultados, de modo que a
+        soma das partes (tokens e requests) é igual ao total do grupo.
+        """
         usage = self.get_usage()
         
+        def share(total: int) -> list[int]:
+            base, rest = divmod(total, n)
+            return [base + (i < rest) for i in range(n)]
+        
+        input_tokens, output_tokens = share(usage.input_tokens), share(usage.output_tokens)
+        requests, cache_read = share(usage.requests), share(usage.cache_read_tokens)
+        return [
+            UsageInfo(
+                input_tokens=input_tokens[i],
+                output_tokens=output_tokens[i],
+                total_tokens=input_tokens[i] + output_tokens[i],
+                requests=requests[i],
+                model_name=usage.model_name,
+                cache_read_tokens=cache_read[i],
+                estimated_cost_usd=usage.estimated_cost_usd / n
+            )
+            for i in range(n)
+        ]
+    
+    def _build_result(
+        self, pdf_info: PitchDeckInfo, info_dict: dict, avaliacao: AvaliacaoStartup,
+        usage: Optional[UsageInfo] = None
+    ) -> dict:
+        """Valida a consistência da avaliação e monta o dicionário de resultado."""
+        self._validate_evaluation_consistency(avaliacao)
+        
+        if usage is None:
+            usage = self.get_usage()
+        
         result = avaliacao.model_dump()
         result['nota_descricao'] = NOTA_DESCRICOES.get(avaliacao.nota, "Desconhecida")
-        result['pdf_info_extracted'] = pdf_info.model_dump()
+        result['pdf_info_extracted'] = info_dict
         result['extraction_model'] = self.extraction_config.name
         result['evaluation_model'] = self.evaluation_config.name
         result['prompt_version'] = self.prompt_version
@@ -287,6 +1241,8 @@ class StartupEvaluator:
             'output_tokens': usage.output_tokens,
             'total_tokens': usage.total_tokens,
             'requests': usage.requests,
+            'cache_read_tokens': usage.cache_read_tokens,
+            'estimated_cost_usd': usage.estimated_cost_usd,
         }
         
         return result
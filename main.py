@@ -6,16 +6,20 @@ Suporta múltiplos modelos: Gemini e OpenAI.
 """
 
 import argparse
+import csv
+import functools
 import os
 import sys
 import logging
 from datetime import datetime
 from pathlib import Path
-from rich.console import Console
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 from dotenv import load_dotenv
+import orjson
 
 # Configura Logger global
 logging.basicConfig(
@@ -28,23 +32,83 @@ logger = logging.getLogger("main")
 # Carrega variáveis de ambiente primeiro
 load_dotenv()
 
-# Configura Logfire para observabilidade (opcional)
-try:
-    import logfire
-    logfire.configure(send_to_logfire='if-token-present')
-    logfire.instrument_pydantic_ai()
-    LOGFIRE_ENABLED = True
-except ImportError:
-    LOGFIRE_ENABLED = False
-
-from evaluator import StartupEvaluator
 from model_config import AVAILABLE_MODELS, DEFAULT_MODEL, get_model_config, list_models
 from prompts import list_prompt_versions, DEFAULT_PROMPT_VERSION
 
+# evaluator (pydantic-ai, SDKs dos providers) e models (pydantic) respondem pela maior
+# parte do tempo de import: são carregados só quando uma avaliação vai de fato rodar,
+# então --help e --list-models não pagam por eles
+if TYPE_CHECKING:
+    from evaluator import StartupEvaluator
+
 console = Console()
 
+# Tabelas de exibição, montadas uma única vez
+_NOTA_COLORS = ("red", "orange1", "orange1", "yellow", "green", "green")  # indexado pela nota
+FAILED = "failed"  # status das linhas de falha no JSONL do lote
+BATCH_API_ENV_VAR = "OPENAI_API_KEY"  # usada por --poll/--collect (a Batch API é só da OpenAI)
+SUMMARY_CSV_COLUMNS = (
+    "pdf_name", "nota", "estagio", "startup", "model", "prompt_version", "estimated_cost_usd", "total_tokens"
+)
+_STATUS_LABELS = ("[red]Nao[/red]", "[green]Sim[/green]")  # indexado por atendido
+_EXTRACTED_FIELDS = (
+    ('nome_startup', "Nome"),
+    ('localizacao', "Localizacao"),
+    ('receita_anual', "Receita Anual"),
+    ('tamanho_rodada', "Tamanho Rodada"),
+    ('valuation_pre_money', "Valuation"),
+)
+
+
+@functools.cache
+def _criterio_labels() -> dict[str, str]:
+    """Títulos dos critérios (campos de CriteriosAtendidos), montados no primeiro uso."""
+    from models import CriteriosAtendidos
+    return {field: field.replace('_', ' ').title() for field in CriteriosAtendidos.model_fields}
+
+
+def _nota_color(nota) -> str:
+    """Cor da nota (0-5) nas tabelas e painéis."""
+    return _NOTA_COLORS[max(0, min(5, int(nota)))]
 
-def evaluate_single_startup(pdf_path: str, model_name: str = DEFAULT_MODEL, prompt_version: str = DEFAULT_PROMPT_VERSION) -> dict:
+
+def _estagio_label(estagio) -> str:
+    """Estágio em maiúsculas (os modelos guardam o valor do enum, ex. 'seed')."""
+    return str(estagio).upper()
+
+
+@functools.lru_cache(maxsize=4)
+def make_evaluator(
+    model_name: str = DEFAULT_MODEL,
+    prompt_version: str = DEFAULT_PROMPT_VERSION,
+    use_cache: bool = True,
+    single_model: bool = False
+) -> "StartupEvaluator":
+    """
+    Cria (ou reutiliza) o avaliador para a combinação modelo/prompt/cache.
+    
+    `model_name` é o modelo de avaliação; a extração usa o modelo mais barato do mesmo
+    provedor (get_extraction_model). Com `single_model`, o próprio `model_name` também
+    extrai (passada única), como exige a Batch API.
+    """
+    from cache import NullCache
+    from evaluator import StartupEvaluator, setup_observability
+    
+    setup_observability()
+    return StartupEvaluator(
+        extraction_model=model_name if single_model else None,
+        evaluation_model=model_name,
+        prompt_version=prompt_version,
+        cache=None if use_cache else NullCache()
+    )
+
+
+def evaluate_single_startup(
+    pdf_path: str,
+    model_name: str = DEFAULT_MODEL,
+    prompt_version: str = DEFAULT_PROMPT_VERSION,
+    use_cache: bool = True
+) -> dict:
     """
     Avalia uma única startup.
     
@@ -52,6 +116,7 @@ def evaluate_single_startup(pdf_path: str, model_name: str = DEFAULT_MODEL, prom
         pdf_path: Caminho para o PDF do pitch deck
         model_name: Nome do modelo a usar
         prompt_version: Versão do prompt a usar
+        use_cache: Se False, ignora o cache de respostas e chama o LLM novamente
         
     Returns:
         Resultado da avaliação
@@ -66,7 +131,7 @@ def evaluate_single_startup(pdf_path: str, model_name: str = DEFAULT_MODEL, prom
         
         task1 = progress.add_task(f"[cyan]Inicializando {model_config.name}...", total=None)
         try:
-            evaluator = StartupEvaluator(model_name=model_name, prompt_version=prompt_version)
+            evaluator = make_evaluator(model_name, prompt_version, use_cache)
         except Exception as e:
             console.print(f"[red]Erro ao inicializar avaliador: {str(e)}[/red]")
             sys.exit(1)
@@ -85,20 +150,14 @@ def evaluate_single_startup(pdf_path: str, model_name: str = DEFAULT_MODEL, prom
 
 def display_result(result: dict, pdf_name: str):
     """Exibe resultado formatado no terminal."""
+    # Os blocos são acumulados e impressos de uma vez (um único render/flush por PDF)
+    out = []
     nota = result.get('nota', 0)
     nota_desc = result.get('nota_descricao', '')
+    nota_color = _nota_color(nota)
     
-    if nota >= 4:
-        nota_color = "green"
-    elif nota >= 3:
-        nota_color = "yellow"
-    elif nota >= 1:
-        nota_color = "orange1"
-    else:
-        nota_color = "red"
-    
-    console.print("\n")
-    console.print(Panel.fit(
+    out.append("\n")
+    out.append(Panel.fit(
         f"[bold {nota_color}]{nota}/5[/bold {nota_color}] - {nota_desc}",
         title="[bold]Avaliacao da Startup[/bold]",
         border_style=nota_color
@@ -109,68 +168,52 @@ def display_result(result: dict, pdf_name: str):
     info_table.add_row("[bold]Modelo:[/bold]", result.get('model_used', 'N/A'))
     info_table.add_row("[bold]Prompt Version:[/bold]", result.get('prompt_version', 'N/A'))
     
-    estagio = result.get('estagio_identificado', 'N/A')
-    if hasattr(estagio, 'value'):
-        estagio = estagio.value
-    info_table.add_row("[bold]Estagio Identificado:[/bold]", str(estagio).upper())
-    console.print(info_table)
+    info_table.add_row("[bold]Estagio Identificado:[/bold]", _estagio_label(result.get('estagio_identificado', 'N/A')))
+    out.append(info_table)
     
     pdf_info = result.get('pdf_info_extracted', {})
     if pdf_info:
-        console.print("\n[bold]Informacoes Extraidas:[/bold]")
+        out.append("\n[bold]Informacoes Extraidas:[/bold]")
         extracted_table = Table(show_header=False, box=None, padding=(0, 2))
         
-        nome = pdf_info.get('nome_startup')
-        if nome:
-            extracted_table.add_row("[dim]Nome:[/dim]", nome)
-        
-        localizacao = pdf_info.get('localizacao')
-        if localizacao:
-            extracted_table.add_row("[dim]Localizacao:[/dim]", localizacao)
-        
-        receita = pdf_info.get('receita_anual')
-        if receita:
-            extracted_table.add_row("[dim]Receita Anual:[/dim]", receita)
-        
-        rodada = pdf_info.get('tamanho_rodada')
-        if rodada:
-            extracted_table.add_row("[dim]Tamanho Rodada:[/dim]", rodada)
-        
-        valuation = pdf_info.get('valuation_pre_money')
-        if valuation:
-            extracted_table.add_row("[dim]Valuation:[/dim]", valuation)
+        for field, label in _EXTRACTED_FIELDS:
+            value = pdf_info.get(field)
+            if value:
+                extracted_table.add_row(f"[dim]{label}:[/dim]", value)
         
-        console.print(extracted_table)
+        out.append(extracted_table)
     
     analise_preliminar = result.get('analise_preliminar')
     if analise_preliminar:
-        console.print("\n[bold cyan]Análise Preliminar (Chain of Thought):[/bold cyan]")
-        console.print(Panel(analise_preliminar, border_style="cyan"))
+        out.append("\n[bold cyan]Análise Preliminar (Chain of Thought):[/bold cyan]")
+        out.append(Panel(analise_preliminar, border_style="cyan"))
     
-    console.print("\n[bold]Justificativa:[/bold]")
-    console.print(Panel(result.get('justificativa', 'Nao disponivel'), border_style="blue"))
+    out.append("\n[bold]Justificativa:[/bold]")
+    out.append(Panel(result.get('justificativa', 'Nao disponivel'), border_style="blue"))
     
     pontos_pos = result.get('pontos_positivos', [])
     if pontos_pos:
-        console.print("\n[bold green]Pontos Positivos:[/bold green]")
-        for ponto in pontos_pos:
-            console.print(f"  - {ponto}")
+        out.append("\n[bold green]Pontos Positivos:[/bold green]")
+        out.extend(f"  - {ponto}" for ponto in pontos_pos)
     
     pontos_neg = result.get('pontos_negativos', [])
     if pontos_neg:
-        console.print("\n[bold red]Pontos Negativos:[/bold red]")
-        for ponto in pontos_neg:
-            console.print(f"  - {ponto}")
+        out.append("\n[bold red]Pontos Negativos:[/bold red]")
+        out.extend(f"  - {ponto}" for ponto in pontos_neg)
     
     criterios = result.get('criterios_atendidos', {})
     if criterios:
-        console.print("\n[bold]Criterios Atendidos:[/bold]")
+        out.append("\n[bold]Criterios Atendidos:[/bold]")
         criterios_table = Table(show_header=True, header_style="bold")
         criterios_table.add_column("Criterio")
         criterios_table.add_column("Status")
         criterios_table.add_column("Evidencia")
         
-        for criterio, criterio_data in criterios.items():
+        # Percorre os critérios conhecidos (campos de CriteriosAtendidos), com os títulos prontos
+        for criterio, label in _criterio_labels().items():
+            criterio_data = criterios.get(criterio)
+            if criterio_data is None:
+                continue
             # Suporta tanto a nova estrutura (dict com 'atendido' e 'evidencia_encontrada')
             # quanto a antiga (bool direto) para compatibilidade
             if isinstance(criterio_data, dict):
@@ -181,103 +224,310 @@ def display_result(result: dict, pdf_name: str):
                 atendido = criterio_data
                 evidencia = 'N/A'
             
-            status = "[green]Sim[/green]" if atendido else "[red]Nao[/red]"
             # Limita o tamanho da evidência para não quebrar a tabela
             evidencia_display = evidencia[:80] + "..." if len(evidencia) > 80 else evidencia
             criterios_table.add_row(
-                criterio.replace('_', ' ').title(), 
-                status,
+                label,
+                _STATUS_LABELS[bool(atendido)],
                 f"[dim]{evidencia_display}[/dim]"
             )
         
-        console.print(criterios_table)
+        out.append(criterios_table)
     
     usage = result.get('usage', {})
     if usage:
-        console.print("\n[bold dim]Uso da API:[/bold dim]")
+        out.append("\n[bold dim]Uso da API:[/bold dim]")
         usage_table = Table(show_header=False, box=None, padding=(0, 2))
         usage_table.add_row(
             "[dim]Tokens:[/dim]", 
             f"{usage.get('total_tokens', 0):,} (input: {usage.get('input_tokens', 0):,}, output: {usage.get('output_tokens', 0):,})"
         )
+        if usage.get('cache_read_tokens'):
+            usage_table.add_row("[dim]Tokens em cache:[/dim]", f"{usage['cache_read_tokens']:,}")
         usage_table.add_row("[dim]Requests:[/dim]", str(usage.get('requests', 0)))
         usage_table.add_row(
             "[dim]Custo estimado:[/dim]", 
             f"[cyan]${usage.get('estimated_cost_usd', 0):.4f} USD[/cyan]"
         )
-        console.print(usage_table)
+        out.append(usage_table)
+    
+    console.print(Group(*out))
 
 
-def process_batch(pdf_folder: str, model_name: str = DEFAULT_MODEL, prompt_version: str = DEFAULT_PROMPT_VERSION):
-    """Processa multiplos pitch decks de uma pasta."""
-    pdf_path = Path(pdf_folder)
-    if not pdf_path.exists():
+def _list_pdfs(pdf_folder: str) -> list[Path]:
+    """Lista os PDFs da pasta, inclusive .PDF (encerra o CLI se a pasta não existir)."""
+    try:
+        # scandir + sufixo evita o fnmatch do glob por entrada; is_file usa o tipo já lido
+        with os.scandir(pdf_folder) as entries:
+            return [
+                Path(entry.path) for entry in entries
+                if entry.name.lower().endswith(".pdf") and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         console.print(f"[red]Pasta nao encontrada: {pdf_folder}[/red]")
         sys.exit(1)
+
+
+def process_batch(
+    pdf_folder: str,
+    model_name: str = DEFAULT_MODEL,
+    prompt_version: str = DEFAULT_PROMPT_VERSION,
+    concurrency: Optional[int] = None,
+    use_cache: bool = True,
+    resume: Optional[str] = None,
+    coalesce: int = 1
+):
+    """
+    Processa multiplos pitch decks de uma pasta, ate `concurrency` ao mesmo tempo.
     
-    pdf_files = list(pdf_path.glob("*.pdf"))
-    if not pdf_files:
-        console.print(f"[yellow]Nenhum PDF encontrado em {pdf_folder}[/yellow]")
-        return
+    Com `coalesce` > 1, cada grupo de `coalesce` PDFs e avaliado em uma unica chamada
+    ao LLM (ver StartupEvaluator.evaluate_batch).
     
-    console.print(f"[bold]Encontrados {len(pdf_files)} PDFs[/bold]\n")
+    Cada resultado e gravado em um JSONL assim que fica pronto (results_<timestamp>.jsonl
+    na pasta), e o resumo final e montado a partir desse arquivo. Com `resume`, os PDFs
+    ja presentes no JSONL informado sao pulados e os novos resultados vao para ele.
+    """
+    pdf_files = _list_pdfs(pdf_folder)
     
-    results = []
-    total_cost = 0.0
+    if resume:
+        results_path = Path(resume)
+        done = set()
+        if results_path.exists():
+            done = {r.get('pdf_name') for r in _read_results(results_path) if r.get('status') != FAILED}
+            _end_last_line(results_path)
+        pdf_files = [f for f in pdf_files if f.name not in done]
+        console.print(f"[dim]Retomando {results_path}: {len(done)} PDFs ja processados[/dim]")
+    else:
+        if not pdf_files:
+            console.print(f"[yellow]Nenhum PDF encontrado em {pdf_folder}[/yellow]")
+            return
+        results_path = Path(pdf_folder) / f"results_{datetime.now():%Y%m%d_%H%M%S}.jsonl"
+    
+    console.print(f"[bold]Encontrados {len(pdf_files)} PDFs[/bold]\n")
     
-    for pdf_file in pdf_files:
-        pdf_name = pdf_file.name
+    if pdf_files:
+        from evaluator import BATCH_CONCURRENCY, run_sync
         
-        console.print(f"\n[bold cyan]Processando: {pdf_name}[/bold cyan]")
         try:
-            result = evaluate_single_startup(str(pdf_file), model_name, prompt_version)
-            result['pdf_name'] = pdf_name
-            results.append(result)
-            total_cost += result.get('usage', {}).get('estimated_cost_usd', 0)
-            display_result(result, pdf_name)
+            evaluator = make_evaluator(model_name, prompt_version, use_cache)
         except Exception as e:
-            console.print(f"[red]Erro ao processar {pdf_name}: {str(e)}[/red]")
-    
-    if results:
-        console.print("\n" + "=" * 50)
-        console.print("[bold]RESUMO FINAL[/bold]")
-        console.print("=" * 50 + "\n")
-        
-        summary_table = Table(show_header=True, header_style="bold")
-        summary_table.add_column("PDF")
-        summary_table.add_column("Nota")
-        summary_table.add_column("Estagio")
-        summary_table.add_column("Startup")
-        summary_table.add_column("Custo")
-        summary_table.add_column("Prompt")
+            console.print(f"[red]Erro ao inicializar avaliador: {str(e)}[/red]")
+            sys.exit(1)
         
-        for r in sorted(results, key=lambda x: x.get('nota', 0), reverse=True):
-            nota = r.get('nota', 0)
-            nota_color = "green" if nota >= 4 else "yellow" if nota >= 3 else "red"
-            
-            estagio = r.get('estagio_identificado', 'N/A')
-            if hasattr(estagio, 'value'):
-                estagio = estagio.value
+        # Os PDFs sao avaliados concorrentemente e cada resultado e exibido e gravado
+        # (com flush) assim que termina: um crash nao perde o que ja foi avaliado
+        with open(results_path, 'ab') as fp, Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console
+        ) as progress:
+            task = progress.add_task(f"[cyan]Avaliando pitch decks (Prompt: {prompt_version})...", total=len(pdf_files))
             
-            nome = r.get('pdf_info_extracted', {}).get('nome_startup', 'N/A')
-            custo = r.get('usage', {}).get('estimated_cost_usd', 0)
-            prompt_ver = r.get('prompt_version', 'N/A')
+            def on_done(pdf_path: str, outcome):
+                pdf_name = Path(pdf_path).name
+                # Falhas também vão para o JSONL (status 'failed'): o lote segue e o
+                # --resume tenta esses PDFs de novo
+                if not _display_outcome(pdf_name, outcome):
+                    outcome = {'pdf_name': pdf_name, 'status': FAILED, 'error': str(outcome)}
+                fp.write(orjson.dumps(outcome, default=str, option=orjson.OPT_APPEND_NEWLINE))
+                fp.flush()
+                progress.advance(task)
             
-            summary_table.add_row(
-                r['pdf_name'],
-                f"[{nota_color}]{nota}/5[/{nota_color}]",
-                str(estagio).upper(),
-                nome or 'N/A',
-                f"${custo:.4f}",
-                prompt_ver
-            )
+            run_sync(evaluator.evaluate_batch(
+                [str(f) for f in pdf_files],
+                concurrency=concurrency or BATCH_CONCURRENCY,
+                coalesce=coalesce,
+                on_done=on_done
+            ))
+    
+    if results_path.exists():
+        failed = set()
+        display_summary(_successful_results(results_path, failed))
+        if failed:
+            console.print(f"[yellow]{len(failed)} PDFs com falha; reprocesse com --resume {results_path}[/yellow]")
         
-        console.print(summary_table)
-        console.print(f"\n[bold]Custo total estimado: [cyan]${total_cost:.4f} USD[/cyan][/bold]")
+        csv_path = results_path.with_suffix('.csv')
+        write_summary_csv(csv_path, _successful_results(results_path, set()))
+        console.print(f"[dim]Resultados em {results_path} (resumo em {csv_path})[/dim]")
+
+
+def _successful_results(results_path: Path, failed: set) -> Iterator[dict]:
+    """
+    Resultados bem-sucedidos do JSONL; ao final, `failed` contém os PDFs cuja falha
+    não foi seguida de um sucesso (numa retomada).
+    """
+    succeeded = set()
+    for r in _read_results(results_path):
+        if r.get('status') == FAILED:
+            failed.add(r.get('pdf_name'))
+        else:
+            succeeded.add(r['pdf_name'])
+            yield r
+    failed -= succeeded
+
+
+def write_summary_csv(csv_path: Path, results: Iterable[dict]):
+    """Grava o resumo do lote em CSV (uma linha por PDF), para análise fora do terminal."""
+    with open(csv_path, 'w', newline='', encoding='utf-8') as fp:
+        writer = csv.writer(fp)
+        writer.writerow(SUMMARY_CSV_COLUMNS)
+        for r in results:
+            usage = r.get('usage', {})
+            writer.writerow((
+                r['pdf_name'],
+                r.get('nota', 0),
+                _estagio_label(r.get('estagio_identificado', 'N/A')),
+                r.get('pdf_info_extracted', {}).get('nome_startup') or '',
+                r.get('evaluation_model', ''),
+                r.get('prompt_version', ''),
+                usage.get('estimated_cost_usd', 0),
+                usage.get('total_tokens', 0)
+            ))
+
+
+def _end_last_line(results_path: Path):
+    """Garante que o JSONL termina em quebra de linha (a ultima linha pode ter sido truncada)."""
+    with open(results_path, 'rb+') as fp:
+        if fp.seek(0, os.SEEK_END) == 0:
+            return
+        fp.seek(-1, os.SEEK_END)
+        if fp.read(1) != b"\n":
+            fp.write(b"\n")
+
+
+def _read_results(results_path: Path) -> Iterator[dict]:
+    """Le os resultados gravados no JSONL (linhas truncadas por um crash sao ignoradas)."""
+    with open(results_path, 'rb') as fp:
+        for line in fp:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logger.warning(f"Linha invalida ignorada em {results_path}")
+
+
+def _display_outcome(pdf_name: str, result) -> bool:
+    """Exibe o resultado (ou o erro) de um PDF do lote; retorna True se a avaliacao deu certo."""
+    console.print(f"\n[bold cyan]Processado: {pdf_name}[/bold cyan]")
+    if isinstance(result, BaseException):
+        console.print(f"[red]Erro ao processar {pdf_name}: {str(result)}[/red]")
+        return False
+    
+    result['pdf_name'] = pdf_name
+    display_result(result, pdf_name)
+    return True
+
 
+def display_batch_results(pdf_names: list[str], outcomes: list):
+    """Exibe os resultados de um lote (exceções aparecem como erro) e o resumo final."""
+    display_summary([
+        result for pdf_name, result in zip(pdf_names, outcomes)
+        if _display_outcome(pdf_name, result)
+    ])
 
-def main():
-    """Funcao principal do CLI."""
+
+def display_summary(results: Iterable[dict]):
+    """Exibe a tabela de resumo (ordenada por nota) e o custo total do lote."""
+    # So os campos da tabela sao mantidos, nao os resultados inteiros
+    rows = []
+    total_cost = 0.0
+    for r in results:
+        custo = r.get('usage', {}).get('estimated_cost_usd', 0)
+        total_cost += custo
+        rows.append((
+            r.get('nota', 0),
+            r['pdf_name'],
+            _estagio_label(r.get('estagio_identificado', 'N/A')),
+            r.get('pdf_info_extracted', {}).get('nome_startup', 'N/A') or 'N/A',
+            custo,
+            r.get('prompt_version', 'N/A')
+        ))
+    
+    if not rows:
+        return
+    
+    console.print("\n" + "=" * 50)
+    console.print("[bold]RESUMO FINAL[/bold]")
+    console.print("=" * 50 + "\n")
+    
+    summary_table = Table(show_header=True, header_style="bold")
+    summary_table.add_column("PDF")
+    summary_table.add_column("Nota")
+    summary_table.add_column("Estagio")
+    summary_table.add_column("Startup")
+    summary_table.add_column("Custo")
+    summary_table.add_column("Prompt")
+    
+    for nota, pdf_name, estagio, nome, custo, prompt_ver in sorted(rows, key=lambda row: row[0], reverse=True):
+        nota_color = _nota_color(nota)
+        summary_table.add_row(
+            pdf_name,
+            f"[{nota_color}]{nota}/5[/{nota_color}]",
+            estagio,
+            nome,
+            f"${custo:.4f}",
+            prompt_ver
+        )
+    
+    console.print(summary_table)
+    console.print(f"\n[bold]Custo total estimado: [cyan]${total_cost:.4f} USD[/cyan][/bold]")
+
+
+def submit_batch_api(pdf_folder: str, model_name: str, prompt_version: str):
+    """Envia os PDFs da pasta para a Batch API da OpenAI (resultados em até 24h)."""
+    pdf_files = _list_pdfs(pdf_folder)
+    if not pdf_files:
+        console.print(f"[yellow]Nenhum PDF encontrado em {pdf_folder}[/yellow]")
+        return
+    
+    try:
+        evaluator = make_evaluator(model_name, prompt_version, single_model=True)
+        with console.status(f"[cyan]Enviando {len(pdf_files)} PDFs para a Batch API..."):
+            batch_id = evaluator.submit_batch([str(f) for f in pdf_files])
+    except Exception as e:
+        console.print(f"[red]Erro ao enviar batch: {str(e)}[/red]")
+        sys.exit(1)
+    
+    console.print(f"[green]Batch enviado:[/green] [bold]{batch_id}[/bold]")
+    console.print(f"[dim]Acompanhe com --poll {batch_id} e baixe com --collect {batch_id} "
+                  f"(mesmos --model/--prompt-version)[/dim]")
+
+
+def poll_batch_api(batch_id: str):
+    """Mostra o status de um job da Batch API."""
+    from evaluator import StartupEvaluator
+    
+    try:
+        batch = StartupEvaluator.batch_status(batch_id)
+    except Exception as e:
+        console.print(f"[red]Erro ao consultar batch: {str(e)}[/red]")
+        sys.exit(1)
+    
+    counts = batch.request_counts
+    console.print(f"Batch {batch_id}: [bold]{batch.status}[/bold]")
+    if counts is not None:
+        console.print(f"Concluidas: {counts.completed}/{counts.total} | Falhas: {counts.failed}")
+
+
+def collect_batch_api(batch_id: str, model_name: str, prompt_version: str):
+    """Baixa e exibe os resultados de um job concluído da Batch API."""
+    try:
+        evaluator = make_evaluator(model_name, prompt_version, single_model=True)
+        outcomes = evaluator.collect_batch(batch_id)
+    except Exception as e:
+        console.print(f"[red]Erro ao coletar batch: {str(e)}[/red]")
+        sys.exit(1)
+    
+    pdf_names = sorted(outcomes)
+    display_batch_results(pdf_names, [outcomes[name] for name in pdf_names])
+
+
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o parser do CLI (uma vez por processo)."""
     parser = argparse.ArgumentParser(
         description="Avaliador de Startups para VC - Analisa pitch decks com IA",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -295,6 +545,11 @@ Exemplos:
   # Processar pasta de PDFs com Prompt V2
   python main.py --folder ./pitch_decks --prompt-version v2
   
+  # Avaliar pasta pela Batch API da OpenAI (50% do custo, ate 24h)
+  python main.py --folder ./pitch_decks --model gpt-5-mini --use-batch-api
+  python main.py --poll <batch_id>
+  python main.py --collect <batch_id> --model gpt-5-mini
+  
   # Listar modelos disponiveis
   python main.py --list-models
         """
@@ -316,10 +571,46 @@ Exemplos:
         choices=list_prompt_versions(),
         help=f'Versao do prompt (padrao: {DEFAULT_PROMPT_VERSION})'
     )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        help='PDFs avaliados ao mesmo tempo no modo --folder (padrao: evaluator.BATCH_CONCURRENCY)'
+    )
+    parser.add_argument(
+        '--coalesce', '-k',
+        type=int,
+        default=1,
+        help='Com --folder, avalia grupos de K PDFs em uma unica chamada ao LLM (padrao: 1, uma chamada por PDF)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignora o cache de respostas em Outputs/.cache e reavalia do zero'
+    )
+    parser.add_argument(
+        '--resume',
+        type=str,
+        metavar='JSONL',
+        help='Com --folder, retoma um lote: pula os PDFs ja gravados no JSONL e acrescenta os novos'
+    )
+    parser.add_argument(
+        '--use-batch-api',
+        action='store_true',
+        help='Com --folder, envia os PDFs para a Batch API da OpenAI em vez de avaliar na hora'
+    )
+    parser.add_argument('--poll', type=str, metavar='BATCH_ID', help='Mostra o status de um batch enviado')
+    parser.add_argument('--collect', type=str, metavar='BATCH_ID', help='Baixa e exibe os resultados de um batch concluido')
     parser.add_argument('--list-models', action='store_true', help='Lista modelos disponiveis')
-    
-    args = parser.parse_args()
-    
+    return parser
+
+
+def main(argv: Optional[list[str]] = None):
+    """Funcao principal do CLI (argv padrao: sys.argv[1:])."""
+    run(build_parser().parse_args(argv))
+
+
+def run(args: argparse.Namespace):
+    """Executa o CLI com argumentos ja interpretados (uso programatico, sem argparse)."""
     if args.list_models:
         console.print(list_models())
         return
@@ -330,23 +621,52 @@ Exemplos:
         console.print(f"[red]Erro: {e}[/red]")
         sys.exit(1)
     
-    if not os.getenv(model_config.env_var):
-        console.print(f"[red]Erro: {model_config.env_var} nao configurada![/red]")
-        console.print(f"Configure a variavel de ambiente para usar {model_config.name}")
-        console.print(f"\nExemplo: export {model_config.env_var}='sua-chave-aqui'")
+    # --poll/--collect falam com a Batch API da OpenAI, qualquer que seja o --model
+    if args.poll or args.collect:
+        env_var, target = BATCH_API_ENV_VAR, "a Batch API da OpenAI"
+    else:
+        env_var, target = model_config.env_var, model_config.name
+    if not os.getenv(env_var):
+        console.print(f"[red]Erro: {env_var} nao configurada![/red]")
+        console.print(f"Configure a variavel de ambiente para usar {target}")
+        console.print(f"\nExemplo: export {env_var}='sua-chave-aqui'")
         sys.exit(1)
     
     console.print(f"[bold]Modelo: {model_config.name} | Prompt: {args.prompt_version}[/bold]")
-    if LOGFIRE_ENABLED:
+    from evaluator import setup_observability
+    
+    if setup_observability():
         console.print("[dim]Logfire ativo - traces em https://logfire.pydantic.dev[/dim]")
     console.print()
     
+    if args.poll:
+        poll_batch_api(args.poll)
+        return
+    
+    if args.collect:
+        collect_batch_api(args.collect, args.model, args.prompt_version)
+        return
+    
+    if args.use_batch_api:
+        if not args.folder:
+            console.print("[red]Erro: --use-batch-api requer --folder[/red]")
+            sys.exit(1)
+        if not model_config.supports_batch_api:
+            console.print(f"[red]Erro: {model_config.name} nao suporta a Batch API[/red]")
+            sys.exit(1)
+        submit_batch_api(args.folder, args.model, args.prompt_version)
+        return
+    
     if args.folder:
-        process_batch(args.folder, args.model, args.prompt_version)
+        process_batch(
+            args.folder, args.model, args.prompt_version,
+            args.concurrency and max(1, args.concurrency), not args.no_cache, args.resume,
+            max(1, args.coalesce)
+        )
         return
     
     if not args.pdf:
-        parser.print_help()
+        build_parser().print_help()
         console.print("\n[red]Erro: --pdf e obrigatorio no modo single[/red]")
         sys.exit(1)
     
@@ -354,7 +674,7 @@ Exemplos:
         console.print(f"[red]PDF nao encontrado: {args.pdf}[/red]")
         sys.exit(1)
     
-    result = evaluate_single_startup(args.pdf, args.model, args.prompt_version)
+    result = evaluate_single_startup(args.pdf, args.model, args.prompt_version, not args.no_cache)
     display_result(result, Path(args.pdf).name)
 
 
@@ -3,18 +3,28 @@ Configuração de modelos disponíveis para o avaliador de startups.
 Suporta múltiplos provedores: Google Gemini e OpenAI.
 """
 
+import functools
 from dataclasses import dataclass
 from typing import Literal
 
 # Tipos de provedores suportados
 ModelProvider = Literal["gemini", "openai"]
 
+# Faixa de custo/capacidade do modelo
+ModelTier = Literal["nano", "mini", "pro"]
+
+# Etapas do pipeline
+ModelTask = Literal["extract", "evaluate"]
+
 
 @dataclass
 class ModelPricing:
     """Preços do modelo por 1M tokens."""
     input_per_million: float
     output_per_million: float
+    # Fração do preço de input cobrada por tokens lidos do cache do provedor
+    # (caching implícito do Gemini 2.5+ e caching automático de prefixo da OpenAI)
+    cached_input_multiplier: float = 1.0
 
 
 @dataclass  
@@ -26,7 +36,10 @@ class ModelConfig:
     env_var: str  # Variável de ambiente para API key
     pricing: ModelPricing
     supports_pdf: bool = True  # Se suporta envio de PDF direto
+    supports_batch_api: bool = False  # Se aceita jobs assíncronos pela Batch API (50% do custo)
     description: str = ""
+    tier: ModelTier = "mini"
+    recommended_for: frozenset[ModelTask] = frozenset({"extract", "evaluate"})
     temperature: float = 0.0
     top_p: float = 0.8
     seed: int = 42 # Seed para reprodutibilidade (onde suportado)
@@ -40,27 +53,33 @@ AVAILABLE_MODELS: dict[str, ModelConfig] = {
         provider="gemini",
         model_string="google-gla:gemini-2.5-flash",
         env_var="GEMINI_API_KEY",
-        pricing=ModelPricing(input_per_million=0.075, output_per_million=0.30),
+        pricing=ModelPricing(input_per_million=0.075, output_per_million=0.30, cached_input_multiplier=0.25),
         supports_pdf=True,
-        description="Rápido e econômico. Bom para análise de PDFs."
+        description="Rápido e econômico. Bom para análise de PDFs.",
+        tier="mini",
+        recommended_for=frozenset({"extract", "evaluate"})
     ),
     "gemini-pro": ModelConfig(
         name="Gemini 2.5 Pro",
         provider="gemini",
         model_string="google-gla:gemini-2.5-pro",
         env_var="GEMINI_API_KEY",
-        pricing=ModelPricing(input_per_million=1.25, output_per_million=5.00),
+        pricing=ModelPricing(input_per_million=1.25, output_per_million=5.00, cached_input_multiplier=0.25),
         supports_pdf=True,
-        description="Mais capaz, melhor raciocínio. Mais caro."
+        description="Mais capaz, melhor raciocínio. Mais caro.",
+        tier="pro",
+        recommended_for=frozenset({"evaluate"})
     ),
     "gemini-3": ModelConfig(
         name="Gemini 3 Pro",
         provider="gemini",
         model_string="google-gla:gemini-3-pro-preview",
         env_var="GEMINI_API_KEY",
-        pricing=ModelPricing(input_per_million=2.00, output_per_million=12.00),
+        pricing=ModelPricing(input_per_million=2.00, output_per_million=12.00, cached_input_multiplier=0.25),
         supports_pdf=True,
-        description="Modelo mais avançado do Google. Contexto de até 2M tokens."
+        description="Modelo mais avançado do Google. Contexto de até 2M tokens.",
+        tier="pro",
+        recommended_for=frozenset({"evaluate"})
     ),
     
     # OpenAI
@@ -69,18 +88,24 @@ AVAILABLE_MODELS: dict[str, ModelConfig] = {
         provider="openai",
         model_string="openai:gpt-5-mini",
         env_var="OPENAI_API_KEY",
-        pricing=ModelPricing(input_per_million=0.25, output_per_million=2.00),
+        pricing=ModelPricing(input_per_million=0.25, output_per_million=2.00, cached_input_multiplier=0.10),
         supports_pdf=False,  # OpenAI não suporta PDF direto, precisa converter
-        description="Modelo intermediário da OpenAI. Equilibrado em custo e capacidade."
+        supports_batch_api=True,
+        description="Modelo intermediário da OpenAI. Equilibrado em custo e capacidade.",
+        tier="mini",
+        recommended_for=frozenset({"extract", "evaluate"})
     ),
     "gpt-5-nano": ModelConfig(
         name="GPT-5 Nano",
         provider="openai",
         model_string="openai:gpt-5-nano",
         env_var="OPENAI_API_KEY",
-        pricing=ModelPricing(input_per_million=0.05, output_per_million=0.40),
+        pricing=ModelPricing(input_per_million=0.05, output_per_million=0.40, cached_input_multiplier=0.10),
         supports_pdf=False,
-        description="Versão mais econômica do GPT-5. Rápido e barato."
+        supports_batch_api=True,
+        description="Versão mais econômica do GPT-5. Rápido e barato.",
+        tier="nano",
+        recommended_for=frozenset({"extract"})
     ),
 }
 
@@ -101,21 +126,50 @@ def get_model_config(model_name: str) -> ModelConfig:
     Raises:
         ValueError: Se o modelo não for encontrado
     """
-    if model_name not in AVAILABLE_MODELS:
+    config = AVAILABLE_MODELS.get(model_name)
+    if config is None:
         available = ", ".join(AVAILABLE_MODELS.keys())
         raise ValueError(f"Modelo '{model_name}' não encontrado. Disponíveis: {available}")
     
-    return AVAILABLE_MODELS[model_name]
+    return config
+
+
+def get_extraction_model(evaluation_model: str) -> str:
+    """
+    Retorna o modelo mais barato do mesmo provedor recomendado para extração.
+    
+    A extração só transcreve dados do PDF (a parte mais cara em tokens), então não
+    precisa do raciocínio do modelo de avaliação.
+    
+    Args:
+        evaluation_model: Nome do modelo de avaliação (ex: 'gemini-pro')
+        
+    Returns:
+        Nome do modelo de extração (o próprio evaluation_model se não houver opção mais barata)
+    """
+    evaluation_config = get_model_config(evaluation_model)
+    candidates = [
+        name for name, config in AVAILABLE_MODELS.items()
+        if config.provider == evaluation_config.provider and "extract" in config.recommended_for
+    ]
+    if not candidates:
+        return evaluation_model
+    
+    cheapest = min(candidates, key=lambda name: AVAILABLE_MODELS[name].pricing.input_per_million)
+    if AVAILABLE_MODELS[cheapest].pricing.input_per_million >= evaluation_config.pricing.input_per_million:
+        return evaluation_model
+    return cheapest
 
 
+@functools.cache
 def list_models() -> str:
-    """Retorna uma string formatada com os modelos disponíveis."""
+    """Retorna uma string formatada com os modelos disponíveis (montada uma vez; o registro é estático)."""
     lines = ["Modelos disponíveis:", ""]
     
     for key, config in AVAILABLE_MODELS.items():
         cost_info = f"${config.pricing.input_per_million:.2f}/${config.pricing.output_per_million:.2f} por 1M tokens"
         pdf_support = "✓ PDF" if config.supports_pdf else "✗ PDF"
-        lines.append(f"  {key:15} - {config.name:20} ({cost_info}) [{pdf_support}]")
+        lines.append(f"  {key:15} - {config.name:20} ({cost_info}) [{pdf_support}] [{config.tier}]")
         lines.append(f"                    {config.description}")
         lines.append("")
     
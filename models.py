@@ -3,11 +3,40 @@ Schemas Pydantic para entrada e saída estruturada.
 Define os modelos de dados para extração e avaliação de startups.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, List, Optional
 from enum import Enum
 
 
+def _compact_json_schema(schema: dict[str, Any], model_cls: type) -> None:
+    """
+    Enxuga o JSON schema enviado ao LLM (menos tokens de input por chamada).
+    
+    Remove `title` (gerado a partir do nome do campo) e `default: null`, e troca
+    `anyOf: [T, null]` por `T` (o campo continua opcional por não estar em `required`).
+    As descrições são mantidas: elas funcionam como instruções de preenchimento.
+    """
+    schema.pop("title", None)
+    for prop in schema.get("properties", {}).values():
+        prop.pop("title", None)
+        if "default" in prop and prop["default"] is None:
+            del prop["default"]
+        variants = prop.get("anyOf")
+        if isinstance(variants, list) and len(variants) == 2 and {"type": "null"} in variants:
+            del prop["anyOf"]
+            prop.update(next(v for v in variants if v != {"type": "null"}))
+
+
+class CompactSchemaModel(BaseModel):
+    """
+    Base dos modelos de saída do LLM, com JSON schema compacto e instâncias imutáveis.
+    
+    Enums são guardados pelo valor (str): model_dump() devolve o mesmo formato que
+    os resultados relidos do cache/JSONL.
+    """
+    model_config = ConfigDict(json_schema_extra=_compact_json_schema, frozen=True, use_enum_values=True)
+
+
 class Estagio(str, Enum):
     """Estágios de investimento suportados pelo fundo."""
     PRE_SEED = "pre_seed"
@@ -16,7 +45,7 @@ class Estagio(str, Enum):
     INDEFINIDO = "indefinido"
 
 
-class PitchDeckInfo(BaseModel):
+class PitchDeckInfo(CompactSchemaModel):
     """Informações extraídas do pitch deck pelo LLM."""
     nome_startup: str = Field(description="Nome da startup")
     localizacao: str = Field(description="País/cidade da startup")
@@ -36,13 +65,13 @@ class PitchDeckInfo(BaseModel):
     outras_informacoes: Optional[str] = Field(default=None, description="Outras informações relevantes")
 
 
-class CriterioAvaliado(BaseModel):
+class CriterioAvaliado(CompactSchemaModel):
     """Avaliação de um critério individual com evidência."""
     atendido: bool = Field(description="Se o critério foi atendido ou não")
     evidencia_encontrada: str = Field(description="Citação direta dos dados extraídos que justifica a decisão")
 
 
-class CriteriosAtendidos(BaseModel):
+class CriteriosAtendidos(CompactSchemaModel):
     """Critérios avaliados pelo analista com evidências."""
     localizacao: CriterioAvaliado = Field(description="Startup está no Brasil")
     estagio_adequado: CriterioAvaliado = Field(description="Estágio compatível com a tese do fundo")
@@ -51,7 +80,7 @@ class CriteriosAtendidos(BaseModel):
     equipe: CriterioAvaliado = Field(description="Equipe qualificada e experiente")
 
 
-class AvaliacaoStartup(BaseModel):
+class AvaliacaoStartup(CompactSchemaModel):
     """Resultado da avaliação de uma startup."""
     analise_preliminar: str = Field(
         description="Análise passo a passo (Chain of Thought) comparando os dados extraídos com os critérios do fundo. "
@@ -65,3 +94,8 @@ class AvaliacaoStartup(BaseModel):
     pontos_negativos: List[str] = Field(description="Lista de pontos negativos ou gaps")
     criterios_atendidos: CriteriosAtendidos = Field(description="Critérios avaliados com evidências")
 
+
+class PitchDeckAnalysis(CompactSchemaModel):
+    """Extração e avaliação produzidas em uma única chamada ao LLM."""
+    info: PitchDeckInfo = Field(description="Informações extraídas do pitch deck")
+    avaliacao: AvaliacaoStartup = Field(description="Avaliação da startup baseada nas informações extraídas")
@@ -3,7 +3,8 @@ Prompts centralizados para o agente de avaliação de startups.
 Edite este arquivo para ajustar o comportamento da IA.
 """
 
-from typing import Dict, Type
+import functools
+from typing import Dict, List, Type
 from config import FUND_CRITERIA, LOCATION
 
 
@@ -11,8 +12,9 @@ from config import FUND_CRITERIA, LOCATION
 # FORMATTERS & HELPERS
 # =============================================================================
 
+@functools.cache
 def format_fund_criteria() -> str:
-    """Formata os critérios do fundo para inclusão no prompt."""
+    """Formata os critérios do fundo para inclusão no prompt (uma vez; V1 e V2 compartilham o texto)."""
     criteria_lines = []
     
     for stage_key, stage_data in FUND_CRITERIA.items():
@@ -37,8 +39,9 @@ def format_fund_criteria() -> str:
     return "\n".join(criteria_lines)
 
 
+@functools.cache
 def format_napkin_astella() -> str:
-    """Formata os critérios do Napkin Astella para referência na seção de Participação."""
+    """Formata os critérios do Napkin Astella para referência na seção de Participação (uma vez)."""
     napkin_lines = []
     napkin_lines.append("=== REFERÊNCIA NAPKIN ASTELLA ===")
     napkin_lines.append("Use os critérios abaixo como referência para avaliar se o montante de investimento, valuation e cap table estão adequados:")
@@ -56,6 +59,35 @@ def format_napkin_astella() -> str:
     return "\n".join(napkin_lines)
 
 
+# =============================================================================
+# TEXTOS COMPARTILHADOS
+# =============================================================================
+
+# Início (PASSO 1 e abertura do PASSO 2) e regras finais das instruções de
+# avaliação, iguais na V1 e na V2; cada versão define só o trecho que muda
+_EVALUATION_STEPS_HEAD = """INSTRUÇÕES (SIGA ESTA ORDEM):
+
+PASSO 1 - ANÁLISE PRELIMINAR (Chain of Thought):
+- Primeiro, preencha o campo "analise_preliminar" com seu raciocínio passo a passo
+- Compare sistematicamente os dados extraídos com os critérios do estágio identificado
+- Para valores numéricos, faça validação matemática explícita:
+  * Exemplo: "Receita anual extraída: R$ 4M. Faixa esperada para Seed: R$ 3.5M-10M. Verificação: 4M está dentro do intervalo? Sim, pois 3.5M ≤ 4M ≤ 10M"
+- Cite diretamente os dados extraídos ao fazer comparações
+- Identifique quais critérios são atendidos e quais não são, com base nas evidências
+
+PASSO 2 - AVALIAÇÃO DE CRITÉRIOS:
+- Para cada critério (localização, estágio, métricas, produto, equipe):
+  * Determine se foi atendido (atendido: true/false)
+  * Cite a evidência específica encontrada nos dados extraídos (evidencia_encontrada)
+"""
+
+_EVALUATION_RULES = """IMPORTANTE:
+- NUNCA invente dados que não foram extraídos
+- SEMPRE cite a fonte (dados extraídos) ao avaliar cada critério
+- Se um valor numérico não estiver na faixa esperada, documente isso claramente na evidência
+- IDIOMA: Responda ESTRITAMENTE em Português do Brasil. Mantenha termos técnicos de VC em inglês (ex: Valuation, Churn, Cap Table)."""
+
+
 # =============================================================================
 # PROMPT VERSIONS
 # =============================================================================
@@ -72,6 +104,42 @@ class BasePrompt:
     @staticmethod
     def get_evaluation_user_prompt(pdf_summary: str) -> str:
         raise NotImplementedError
+    
+    # Usado no lugar do resumo quando extração e avaliação acontecem na mesma chamada
+    SINGLE_PASS_SUMMARY = "(use as informações que você extraiu do pitch deck no campo `info`)"
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_single_pass_system_prompt(cls) -> str:
+        """Prompt de sistema para extração + avaliação em uma única chamada ao LLM."""
+        return f"""{cls.EXTRACTION_SYSTEM_PROMPT}
+
+Após a extração, você também atuará como avaliador:
+
+{cls.get_evaluation_system_prompt()}"""
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def get_single_pass_user_prompt(cls) -> str:
+        """Prompt de usuário para extração + avaliação em uma única chamada ao LLM."""
+        return f"""ETAPA 1 - {cls.EXTRACTION_USER_PROMPT} Preencha o campo `info` com as informações extraídas.
+
+ETAPA 2 - Preencha o campo `avaliacao` seguindo as instruções abaixo, baseando-se exclusivamente no que foi extraído na etapa 1.
+
+{cls.get_evaluation_user_prompt(cls.SINGLE_PASS_SUMMARY)}"""
+    
+    @classmethod
+    def get_multi_evaluation_user_prompt(cls, pdf_summaries: List[str]) -> str:
+        """Prompt de usuário para avaliar várias startups em uma única chamada ao LLM."""
+        n = len(pdf_summaries)
+        startups = "\n\n".join(
+            f"[STARTUP {i}]\n{cls.get_evaluation_user_prompt(summary)}"
+            for i, summary in enumerate(pdf_summaries, 1)
+        )
+        return f"""Avalie de forma independente cada uma das {n} startups abaixo. Não compare as startups entre si: cada avaliação deve se basear apenas nas informações da própria startup.
+Retorne uma lista com exatamente {n} avaliações, na mesma ordem das startups.
+
+{startups}"""
 
 
 class PromptV1(BasePrompt):
@@ -123,23 +191,9 @@ DIRETRIZES DE EXTRAÇÃO:
 - 4: Forte - atende maioria dos critérios, definitivamente vale conversar
 - 5: Excepcional - atende todos os critérios, prioridade máxima para reunião"""
 
-    EVALUATION_INSTRUCTIONS = """INSTRUÇÕES (SIGA ESTA ORDEM):
-
-PASSO 1 - ANÁLISE PRELIMINAR (Chain of Thought):
-- Primeiro, preencha o campo "analise_preliminar" com seu raciocínio passo a passo
-- Compare sistematicamente os dados extraídos com os critérios do estágio identificado
-- Para valores numéricos, faça validação matemática explícita:
-  * Exemplo: "Receita anual extraída: R$ 4M. Faixa esperada para Seed: R$ 3.5M-10M. Verificação: 4M está dentro do intervalo? Sim, pois 3.5M ≤ 4M ≤ 10M"
-- Cite diretamente os dados extraídos ao fazer comparações
-- Identifique quais critérios são atendidos e quais não são, com base nas evidências
-
-PASSO 2 - AVALIAÇÃO DE CRITÉRIOS:
-- Para cada critério (localização, estágio, métricas, produto, equipe):
-  * Determine se foi atendido (atendido: true/false)
-  * Cite a evidência específica encontrada nos dados extraídos (evidencia_encontrada)
-  * Exemplo: "Localização: atendido=true, evidencia_encontrada='Localização: São Paulo, Brasil'"
+    EVALUATION_INSTRUCTIONS = _EVALUATION_STEPS_HEAD + """  * Exemplo: "Localização: atendido=true, evidencia_encontrada='Localização: São Paulo, Brasil'"
 - Seja rigoroso: se a evidência não estiver clara nos dados, marque como não atendido
-- Preencha os campos de saída exigidos: 
+- Preencha os campos de saída exigidos:
   * pontos_positivos: lista com 3-5 bullets curtos e objetivos
   * pontos_negativos: lista com 3-5 bullets curtos; inclua "informação faltante sobre X" quando aplicável
 
@@ -153,13 +207,10 @@ PASSO 3 - ATRIBUIÇÃO DA NOTA:
 7. Forneça justificativa detalhada explicando a nota
 8. Justifique a nota baseando-se EXCLUSIVAMENTE nas evidências extraídas
 
-IMPORTANTE:
-- NUNCA invente dados que não foram extraídos
-- SEMPRE cite a fonte (dados extraídos) ao avaliar cada critério
-- Se um valor numérico não estiver na faixa esperada, documente isso claramente na evidência
-- IDIOMA: Responda ESTRITAMENTE em Português do Brasil. Mantenha termos técnicos de VC em inglês (ex: Valuation, Churn, Cap Table)."""
+""" + _EVALUATION_RULES
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_evaluation_system_prompt() -> str:
         criteria_text = format_fund_criteria()
         return f"""Você é um analista experiente de um fundo de Venture Capital brasileiro.
@@ -174,19 +225,23 @@ LOCALIZAÇÃO: {LOCATION}
 
 {PromptV1.EVALUATION_INSTRUCTIONS}"""
 
-    @staticmethod
-    def get_evaluation_user_prompt(pdf_summary: str) -> str:
-        return f"""Avalie esta startup baseado nas informações extraídas do pitch deck:
-
-INFORMAÇÕES DO PITCH DECK:
-{pdf_summary}
+    # Texto fixo antes do resumo: o prefixo da mensagem é o mesmo em todas as
+    # chamadas e entra no cache de prompt do provedor
+    EVALUATION_USER_PROMPT_TEMPLATE = """Avalie esta startup baseado nas informações extraídas do pitch deck.
 
 IMPORTANTE: Siga a ordem das instruções:
 1. Primeiro, preencha "analise_preliminar" com seu raciocínio passo a passo comparando os dados com os critérios
 2. Depois, avalie cada critério fornecendo evidências específicas dos dados extraídos
 3. Por fim, atribua a nota final baseada exclusivamente nas evidências encontradas
 
-Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada."""
+Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada.
+
+INFORMAÇÕES DO PITCH DECK:
+{pdf_summary}"""
+
+    @staticmethod
+    def get_evaluation_user_prompt(pdf_summary: str) -> str:
+        return PromptV1.EVALUATION_USER_PROMPT_TEMPLATE.format(pdf_summary=pdf_summary)
 
 
 class PromptV2(BasePrompt):
@@ -206,21 +261,7 @@ class PromptV2(BasePrompt):
 - 4: Forte - atende maioria dos critérios, tese sólida, definitivamente vale conversar.
 - 5: Excepcional - atende todos os critérios, prioridade máxima para reunião."""
 
-    EVALUATION_INSTRUCTIONS = """INSTRUÇÕES (SIGA ESTA ORDEM):
-
-PASSO 1 - ANÁLISE PRELIMINAR (Chain of Thought):
-- Primeiro, preencha o campo "analise_preliminar" com seu raciocínio passo a passo
-- Compare sistematicamente os dados extraídos com os critérios do estágio identificado
-- Para valores numéricos, faça validação matemática explícita:
-  * Exemplo: "Receita anual extraída: R$ 4M. Faixa esperada para Seed: R$ 3.5M-10M. Verificação: 4M está dentro do intervalo? Sim, pois 3.5M ≤ 4M ≤ 10M"
-- Cite diretamente os dados extraídos ao fazer comparações
-- Identifique quais critérios são atendidos e quais não são, com base nas evidências
-
-PASSO 2 - AVALIAÇÃO DE CRITÉRIOS:
-- Para cada critério (localização, estágio, métricas, produto, equipe):
-  * Determine se foi atendido (atendido: true/false)
-  * Cite a evidência específica encontrada nos dados extraídos (evidencia_encontrada)
-  * IMPORTANTE SOBRE LOCALIZAÇÃO: Se a localização for 'null' (não informada), considere como "Não Atendido" mas NÃO ELIMINE a startup apenas por isso. Marque a evidência como "Localização não informada no deck".
+    EVALUATION_INSTRUCTIONS = _EVALUATION_STEPS_HEAD + """  * IMPORTANTE SOBRE LOCALIZAÇÃO: Se a localização for 'null' (não informada), considere como "Não Atendido" mas NÃO ELIMINE a startup apenas por isso. Marque a evidência como "Localização não informada no deck".
 - Preencha os campos de saída exigidos:
   * pontos_positivos: 3-5 bullets objetivos baseados no deck
   * pontos_negativos: 3-5 bullets objetivos; inclua faltas de dados e penalidades
@@ -238,13 +279,10 @@ PASSO 3 - ATRIBUIÇÃO DA NOTA:
 6. Forneça justificativa detalhada explicando a nota
 7. Justifique a nota baseando-se EXCLUSIVAMENTE nas evidências extraídas
 
-IMPORTANTE:
-- NUNCA invente dados que não foram extraídos
-- SEMPRE cite a fonte (dados extraídos) ao avaliar cada critério
-- Se um valor numérico não estiver na faixa esperada, documente isso claramente na evidência
-- IDIOMA: Responda ESTRITAMENTE em Português do Brasil. Mantenha termos técnicos de VC em inglês (ex: Valuation, Churn, Cap Table)."""
+""" + _EVALUATION_RULES
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_evaluation_system_prompt() -> str:
         criteria_text = format_fund_criteria()
         return f"""Você é um analista experiente de um fundo de Venture Capital brasileiro.
@@ -259,19 +297,23 @@ LOCALIZAÇÃO: {LOCATION}
 
 {PromptV2.EVALUATION_INSTRUCTIONS}"""
 
-    @staticmethod
-    def get_evaluation_user_prompt(pdf_summary: str) -> str:
-        return f"""Avalie esta startup baseado nas informações extraídas do pitch deck:
-
-INFORMAÇÕES DO PITCH DECK:
-{pdf_summary}
+    # Texto fixo antes do resumo: o prefixo da mensagem é o mesmo em todas as
+    # chamadas e entra no cache de prompt do provedor
+    EVALUATION_USER_PROMPT_TEMPLATE = """Avalie esta startup baseado nas informações extraídas do pitch deck.
 
 IMPORTANTE: Siga a ordem das instruções:
 1. Primeiro, preencha "analise_preliminar" com seu raciocínio passo a passo comparando os dados com os critérios
 2. Depois, avalie cada critério fornecendo evidências específicas dos dados extraídos
 3. Por fim, atribua a nota final baseada exclusivamente nas evidências encontradas
 
-Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada."""
+Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada.
+
+INFORMAÇÕES DO PITCH DECK:
+{pdf_summary}"""
+
+    @staticmethod
+    def get_evaluation_user_prompt(pdf_summary: str) -> str:
+        return PromptV2.EVALUATION_USER_PROMPT_TEMPLATE.format(pdf_summary=pdf_summary)
 
 
 class PromptAstella(BasePrompt):
@@ -283,12 +325,11 @@ class PromptAstella(BasePrompt):
     EXTRACTION_SYSTEM_PROMPT = PromptV1.EXTRACTION_SYSTEM_PROMPT
     EXTRACTION_USER_PROMPT = PromptV1.EXTRACTION_USER_PROMPT
 
-    SCORING_CRITERIA = """
-## TABELA DE CRITÉRIOS DE AVALIAÇÃO ASTELLA
+    SCORING_CRITERIA = """## TABELA DE CRITÉRIOS DE AVALIAÇÃO ASTELLA
 
 REGRA GERAL DE AUSÊNCIA: Se a informação não consta no deck, a pontuação é 0. O ônus da prova é da startup. Não assuma que "provavelmente eles têm".
 
-Você deve avaliar cada critério abaixo e atribuir pontos conforme a qualidade observada. 
+Você deve avaliar cada critério abaixo e atribuir pontos conforme a qualidade observada.
 Para cada critério, verifique em qual nível a startup se enquadra.
 
 ### PESSOAS (Total: 25 pontos)
@@ -408,8 +449,7 @@ Para cada critério, verifique em qual nível a startup se enquadra.
 - **Nota 1 (Muito Fraca):** 40 - 89 pontos (15% - 35%). Não investível.
 - **Nota 0 (Descartável):** < 40 pontos. Passar rápido.
 
-No caso de pontuação < 140 (Nota 0-2), formular um texto de recusa preciso e educado.
-"""
+No caso de pontuação < 140 (Nota 0-2), formular um texto de recusa preciso e educado."""
 
     EVALUATION_INSTRUCTIONS = """INSTRUÇÕES (SIGA ESTA ORDEM):
 
@@ -454,9 +494,10 @@ IMPORTANTE:
 """
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def get_evaluation_system_prompt() -> str:
         napkin_text = format_napkin_astella()
-        return f"""Você é um analista de Venture Capital na Astella, um fundo de investimentos que busca retornos no nível top quartile global. 
+        return f"""Você é um analista de Venture Capital na Astella, um fundo de investimentos que busca retornos no nível top quartile global.
 Com base nos critérios de investimento da tabela abaixo você deve ser capaz de pontuar qualidades em startups e fundadores.
 
 {napkin_text}
@@ -465,12 +506,8 @@ Com base nos critérios de investimento da tabela abaixo você deve ser capaz de
 
 {PromptAstella.EVALUATION_INSTRUCTIONS}"""
 
-    @staticmethod
-    def get_evaluation_user_prompt(pdf_summary: str) -> str:
-        return f"""Avalie esta startup baseado nas informações extraídas do pitch deck usando o sistema de pontuação Astella:
-
-INFORMAÇÕES DO PITCH DECK:
-{pdf_summary}
+    # Texto fixo antes do resumo (prefixo estável para o cache de prompt do provedor)
+    EVALUATION_USER_PROMPT_TEMPLATE = """Avalie esta startup baseado nas informações extraídas do pitch deck usando o sistema de pontuação Astella.
 
 IMPORTANTE: Siga a ordem das instruções:
 1. Primeiro, preencha "analise_preliminar" com o cálculo detalhado da pontuação, critério por critério
@@ -480,7 +517,14 @@ IMPORTANTE: Siga a ordem das instruções:
 
 Quando o material fornecido não for suficiente, indique claramente quais informações faltam e penalize conforme a regra de ausência. Não utilize fontes externas.
 
-Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada."""
+Forneça uma avaliação completa com nota de 0-5 e justificativa detalhada.
+
+INFORMAÇÕES DO PITCH DECK:
+{pdf_summary}"""
+
+    @staticmethod
+    def get_evaluation_user_prompt(pdf_summary: str) -> str:
+        return PromptAstella.EVALUATION_USER_PROMPT_TEMPLATE.format(pdf_summary=pdf_summary)
 
 
 # =============================================================================